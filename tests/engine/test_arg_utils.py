@@ -5,7 +5,10 @@ from argparse import ArgumentError, ArgumentTypeError
 import pytest
 
 from vllm.config import PoolerConfig
-from vllm.engine.arg_utils import EngineArgs, nullable_kvs
+from vllm.engine.arg_utils import (_NULLABLE_STR_ARGS, _STORE_BOOLEAN_FLAGS,
+                                   _STORE_TRUE_FLAGS, EngineArgs, json_loads,
+                                   nullable_float_tuple, nullable_kvs,
+                                   nullable_regex)
 from vllm.utils import FlexibleArgumentParser
 
 
@@ -33,6 +36,62 @@ def test_limit_mm_per_prompt_parser(arg, expected):
     assert args.limit_mm_per_prompt == expected
 
 
+def test_limit_mm_per_prompt_parser_returns_copies():
+    parser = EngineArgs.add_cli_args(FlexibleArgumentParser())
+    args = parser.parse_args(["--limit-mm-per-prompt", "image=2"])
+    args.limit_mm_per_prompt["image"] = 4
+
+    args = parser.parse_args(["--limit-mm-per-prompt", "image=2"])
+    assert args.limit_mm_per_prompt == {"image": 2}
+
+
+def test_parsers_do_not_share_actions():
+    parser = EngineArgs.add_cli_args(FlexibleArgumentParser())
+    assert parser.parse_args([]).max_model_len is None
+    # Changes the default of the parser's existing action.
+    parser.set_defaults(max_model_len=1024)
+    assert parser.parse_args([]).max_model_len == 1024
+
+    other_parser = EngineArgs.add_cli_args(FlexibleArgumentParser())
+    assert other_parser.parse_args([]).max_model_len is None
+
+
+def test_resolve_overridden_flags():
+    parser = EngineArgs.add_cli_args(
+        FlexibleArgumentParser(conflict_handler="resolve"))
+    # Overrides the engine argument, as if it had been added right away.
+    parser.add_argument("--seed", type=int, default=42)
+    assert parser.parse_args([]).seed == 42
+    assert parser.parse_args(["--seed", "1"]).seed == 1
+
+    # The override does not affect other parsers.
+    other_parser = EngineArgs.add_cli_args(FlexibleArgumentParser())
+    assert other_parser.parse_args([]).seed == EngineArgs.seed
+    assert other_parser.parse_args(["--seed", "1"]).seed == 1
+
+
+def test_arg_table_flags_are_added():
+    parser = EngineArgs.add_cli_args(FlexibleArgumentParser())
+    parser.parse_args([])
+    for table in (_NULLABLE_STR_ARGS, _STORE_TRUE_FLAGS,
+                  _STORE_BOOLEAN_FLAGS):
+        for entries in table.values():
+            for flag, _, _ in entries:
+                assert flag in parser._option_string_actions
+
+
+def test_ignore_patterns():
+    parser = EngineArgs.add_cli_args(FlexibleArgumentParser())
+    assert parser.parse_args([]).ignore_patterns is None
+
+    args = parser.parse_args(
+        ["--ignore-patterns", "*.bin", "--ignore-patterns", "original/*"])
+    assert args.ignore_patterns == ["*.bin", "original/*"]
+    # Appending must not leak into the default of other parsers.
+    other_parser = EngineArgs.add_cli_args(FlexibleArgumentParser())
+    assert other_parser.parse_args([]).ignore_patterns is None
+
+
 def test_compilation_config():
     parser = EngineArgs.add_cli_args(FlexibleArgumentParser())
 
@@ -61,6 +120,31 @@ def test_compilation_config():
     assert args.compilation_config.level == 3
 
 
+@pytest.mark.parametrize(("arg", "expected"), [
+    (None, None),
+    ("4", (4.0, )),
+    ("4,8.5", (4.0, 8.5)),
+    ([4, 8], (4.0, 8.0)),
+])
+def test_long_lora_scaling_factors(arg, expected):
+    engine_args = EngineArgs(long_lora_scaling_factors=arg)
+    assert engine_args.long_lora_scaling_factors == expected
+
+
+def test_long_lora_scaling_factors_from_cli():
+    parser = EngineArgs.add_cli_args(FlexibleArgumentParser())
+    args = parser.parse_args(["--long-lora-scaling-factors", "4,8"])
+    assert args.long_lora_scaling_factors == (4.0, 8.0)
+    engine_args = EngineArgs.from_cli_args(args=args)
+    assert engine_args.long_lora_scaling_factors == (4.0, 8.0)
+
+
+@pytest.mark.parametrize("arg", ["4,", "4,eight"])
+def test_bad_nullable_float_tuple(arg):
+    with pytest.raises(ArgumentTypeError):
+        nullable_float_tuple(arg)
+
+
 def test_prefix_cache_default():
     parser = EngineArgs.add_cli_args(FlexibleArgumentParser())
     args = parser.parse_args([])
@@ -91,6 +175,27 @@ def test_valid_pooling_config():
         pooling_type="MEAN", )
 
 
+def test_from_dict():
+    engine_args = EngineArgs.from_dict({
+        "model": "facebook/opt-125m",
+        "max_model_len": 1024,
+    })
+    assert engine_args.model == "facebook/opt-125m"
+    assert engine_args.max_model_len == 1024
+    # Missing fields keep their defaults, and are set up as usual.
+    assert engine_args.tokenizer == "facebook/opt-125m"
+    assert engine_args.dtype == EngineArgs.dtype
+
+
+def test_from_dict_unknown_keys():
+    # E.g. a misspelled max_num_seqs must not fall back to the default.
+    with pytest.raises(ValueError, match="max_num_seq"):
+        EngineArgs.from_dict({
+            "model": "facebook/opt-125m",
+            "max_num_seq": 8,
+        })
+
+
 @pytest.mark.parametrize(
     ("arg"),
     [
@@ -103,6 +208,57 @@ def test_bad_nullable_kvs(arg):
         nullable_kvs(arg)
 
 
+@pytest.mark.parametrize(("arg", "message"), [
+    ("image", "Each item should be in the form KEY=VALUE"),
+    ("Image=X", "Failed to parse value of item image=x"),
+    ("image=4,Image=5", "Conflicting values specified for key: image"),
+])
+def test_bad_nullable_kvs_message(arg, message):
+    with pytest.raises(ArgumentTypeError) as exc_info:
+        nullable_kvs(arg)
+    assert str(exc_info.value) == message
+
+
+@pytest.mark.parametrize(("arg", "expected"), [
+    ("", None),
+    ("None", None),
+    (r"mymodule\..*", r"mymodule\..*"),
+])
+def test_nullable_regex(arg, expected):
+    assert nullable_regex(arg) == expected
+
+
+def test_bad_logits_processor_pattern():
+    with pytest.raises(ArgumentTypeError):
+        nullable_regex("mymodule.(")
+
+    with pytest.raises(ValueError):
+        EngineArgs(logits_processor_pattern="mymodule.(")
+
+
+@pytest.mark.parametrize(("arg", "expected"), [
+    ('{"num_crops": 4}', {"num_crops": 4}),
+    ('[1, 2.5, "a", null, true]', [1, 2.5, "a", None, True]),
+    # Accepted by json, but not by orjson
+    ('{"a": Infinity}', {"a": float("inf")}),
+])
+def test_json_loads(arg, expected):
+    assert json_loads(arg) == expected
+
+
+# Integers outside of the 64-bit range are parsed as floats by orjson
+@pytest.mark.parametrize("val", [2**64 - 1, 2**64, 2**64 + 1, -2**63 - 1])
+def test_json_loads_big_ints(val):
+    parsed = json_loads(f'{{"a": [{val}]}}')["a"][0]
+    assert parsed == val
+    assert type(parsed) is int
+
+
+def test_bad_json_loads():
+    with pytest.raises(ValueError):
+        json_loads('{"num_crops": 4')
+
+
 # yapf: disable
 @pytest.mark.parametrize(("arg", "expected", "option"), [
     (None, None, "mm-processor-kwargs"),
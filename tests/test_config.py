@@ -1,12 +1,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
+import os
 from dataclasses import asdict
+from pathlib import Path
 
 import pytest
 
 from vllm.config import ModelConfig, PoolerConfig
 from vllm.model_executor.layers.pooler import PoolingType
 from vllm.platforms import current_platform
+from vllm.transformers_utils.utils import check_gguf_file
 
 
 @pytest.mark.parametrize(
@@ -354,3 +357,30 @@ def test_generation_config_loading():
         override_generation_config=override_generation_config)
 
     assert model_config.get_diff_sampling_param() == override_generation_config
+
+
+def test_check_gguf_file(tmp_path, monkeypatch):
+    model = tmp_path / "model.bin"
+    model.write_bytes(b"GGUF" + bytes(4))
+    assert check_gguf_file(model)
+
+    # Rewriting the header is picked up, even if the size stays the same.
+    mtime_ns = model.stat().st_mtime_ns
+    model.write_bytes(b"PK\x03\x04" + bytes(4))
+    os.utime(model, ns=(mtime_ns + 1, mtime_ns + 1))
+    assert not check_gguf_file(model)
+
+    model.write_bytes(b"GGUF" + bytes(8))
+    assert check_gguf_file(model)
+
+    # Errors while reading the header are not cached.
+    other_model = tmp_path / "other_model.bin"
+    other_model.write_bytes(b"GGUF" + bytes(4))
+
+    def raise_permission_error(*args, **kwargs):
+        raise PermissionError
+
+    with monkeypatch.context() as m:
+        m.setattr(Path, "open", raise_permission_error)
+        assert not check_gguf_file(other_model)
+    assert check_gguf_file(other_model)
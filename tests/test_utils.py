@@ -200,6 +200,27 @@ def test_missing_required_argument(parser):
         parser.parse_args([])
 
 
+def test_lazy_arguments(parser):
+    calls = []
+
+    def add_arguments(p):
+        calls.append(p)
+        p.add_argument('--lazy-arg', type=int, default=1)
+
+    parser.add_lazy_arguments(add_arguments)
+    parser.set_defaults(lazy_arg=2)
+    assert not calls
+
+    args = parser.parse_args(['--batch-size', '4'])
+    assert calls == [parser]
+    assert args.batch_size == 4
+    assert args.lazy_arg == 2
+
+    assert parser.parse_args(['--lazy_arg', '3']).lazy_arg == 3
+    assert '--lazy-arg' in parser.format_help()
+    assert len(calls) == 1
+
+
 def test_cli_override_to_config(parser_with_config, cli_config_file):
     args = parser_with_config.parse_args([
         'serve', 'mymodel', '--config', cli_config_file,
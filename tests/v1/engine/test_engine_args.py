@@ -6,7 +6,7 @@ import pytest
 
 from vllm import envs
 from vllm.config import VllmConfig
-from vllm.engine.arg_utils import EngineArgs
+from vllm.engine.arg_utils import _ENGINE_CONFIG_CACHE, EngineArgs
 from vllm.usage.usage_lib import UsageContext
 from vllm.utils import FlexibleArgumentParser
 
@@ -78,3 +78,55 @@ def test_defaults_with_usage_context():
         UsageContext.OPENAI_API_SERVER)
     assert vllm_config.scheduler_config.max_num_seqs == default_max_num_seqs
     assert vllm_config.scheduler_config.max_num_batched_tokens == default_server_tokens  # noqa: E501
+
+
+def test_create_engine_config_is_memoized(monkeypatch):
+    monkeypatch.setenv("VLLM_MEMOIZE_ENGINE_CONFIG", "1")
+    engine_args = EngineArgs(model="facebook/opt-125m")
+    vllm_config = engine_args.create_engine_config()
+
+    hits = _ENGINE_CONFIG_CACHE.stat().hits
+    other_engine_args = EngineArgs(model="facebook/opt-125m")
+    other_vllm_config = other_engine_args.create_engine_config()
+    assert _ENGINE_CONFIG_CACHE.stat().hits == hits + 1
+
+    # The memoized config is a copy, and the engine arguments get the same
+    # defaults as the first time.
+    assert other_vllm_config is not vllm_config
+    assert other_vllm_config.model_config is not vllm_config.model_config
+    assert other_vllm_config.compute_hash() == vllm_config.compute_hash()
+    assert other_engine_args.max_num_seqs == engine_args.max_num_seqs
+
+
+def test_engine_config_cache_key(monkeypatch, tmp_path):
+    engine_args = EngineArgs(model="facebook/opt-125m")
+    # Configs are only memoized on request.
+    monkeypatch.delenv("VLLM_MEMOIZE_ENGINE_CONFIG", raising=False)
+    assert engine_args._engine_config_cache_key(None) is None
+
+    monkeypatch.setenv("VLLM_MEMOIZE_ENGINE_CONFIG", "1")
+    key = engine_args._engine_config_cache_key(None)
+    assert key is not None
+    assert engine_args._engine_config_cache_key(None) == key
+
+    # Configs built for other devices or another working directory are not
+    # reused.
+    monkeypatch.setenv("CUDA_VISIBLE_DEVICES", "1,0")
+    device_key = engine_args._engine_config_cache_key(None)
+    assert device_key not in (None, key)
+    monkeypatch.chdir(tmp_path)
+    assert engine_args._engine_config_cache_key(None) not in (None, key,
+                                                              device_key)
+
+    # Data parallel configs get a new port each time, and distributed
+    # configs depend on the Ray state.
+    dp_engine_args = EngineArgs(model="facebook/opt-125m",
+                                data_parallel_size=2)
+    assert dp_engine_args._engine_config_cache_key(None) is None
+    tp_engine_args = EngineArgs(model="facebook/opt-125m",
+                                tensor_parallel_size=2)
+    assert tp_engine_args._engine_config_cache_key(None) is None
+
+    # Local models may change on disk.
+    local_engine_args = EngineArgs(model=str(tmp_path))
+    assert local_engine_args._engine_config_cache_key(None) is None
@@ -1,13 +1,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import argparse
+import copy
 import dataclasses
+import functools
 import json
+import os
 import re
+import sys
 import threading
 from dataclasses import dataclass
-from typing import (TYPE_CHECKING, Any, Dict, List, Literal, Mapping, Optional,
-                    Tuple, Type, Union, cast, get_args)
+from typing import (TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Hashable,
+                    List, Literal, Mapping, Optional, Tuple, Type, Union,
+                    cast, get_args)
 
 import torch
 
@@ -28,7 +33,13 @@ from vllm.reasoning import ReasoningParserManager
 from vllm.test_utils import MODEL_WEIGHTS_S3_BUCKET, MODELS_ON_S3
 from vllm.transformers_utils.utils import check_gguf_file
 from vllm.usage.usage_lib import UsageContext
-from vllm.utils import FlexibleArgumentParser, StoreBoolean, is_in_ray_actor
+from vllm.utils import (FlexibleArgumentParser, LRUCache, StoreBoolean,
+                        is_in_ray_actor, random_uuid)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 if TYPE_CHECKING:
     from vllm.transformers_utils.tokenizer_group import BaseTokenizerGroup
@@ -36,6 +47,7 @@ if TYPE_CHECKING:
 logger = init_logger(__name__)
 
 ALLOWED_DETAILED_TRACE_MODULES = ["model", "worker", "all"]
+_DETAILED_TRACE_MODULES_STR = ",".join(ALLOWED_DETAILED_TRACE_MODULES)
 
 DEVICE_OPTIONS = [
     "auto",
@@ -47,6 +59,49 @@ DEVICE_OPTIONS = [
     "hpu",
 ]
 
+# Choices of the enum-like string arguments. Values given on the command line
+# are interned (`type=sys.intern`) so that comparing them against these
+# literals downstream can short-circuit on identity. Choices are kept as
+# ordered sequences rather than sets, since argparse lists them in that order
+# in the help and in error messages.
+_TOKENIZER_MODE_CHOICES = ("auto", "slow", "mistral", "custom")
+_DTYPE_CHOICES = ("auto", "half", "float16", "bfloat16", "float", "float32")
+_KV_CACHE_DTYPE_CHOICES = ("auto", "fp8", "fp8_e5m2", "fp8_e4m3")
+_PREFIX_CACHING_HASH_ALGO_CHOICES = ("builtin", "sha256")
+_DISTRIBUTED_EXECUTOR_BACKEND_CHOICES = ("ray", "mp", "uni",
+                                         "external_launcher")
+_SCHEDULING_POLICY_CHOICES = ("fcfs", "priority")
+_LORA_DTYPE_CHOICES = ("auto", "float16", "bfloat16")
+
+# Choices derived from the config enums, computed once at import time.
+# The --quantization choices are still built per parser: plugins may register
+# new methods, and platforms may extend the parser's list in place.
+_TASK_CHOICES = get_args(TaskOption)
+_LOAD_FORMAT_CHOICES = tuple(f.value for f in LoadFormat)
+_CONFIG_FORMAT_CHOICES = tuple(f.value for f in ConfigFormat)
+_MODEL_IMPL_CHOICES = tuple(f.value for f in ModelImpl)
+_BLOCK_SIZE_CHOICES = (8, 16, 32, 64, 128)
+
+# Environment variables that may change the config built from the same engine
+# arguments. VLLM_USE_V1 is handled separately, since building the config
+# sets it when it is unset.
+_ENGINE_CONFIG_ENV_PREFIXES = ("VLLM_", "HF_")
+# The device control variables of the in-tree platforms, which decide e.g.
+# the number of visible devices and thus the distributed executor backend.
+_DEVICE_CONTROL_ENV_VARS = frozenset({
+    "CUDA_VISIBLE_DEVICES", "HIP_VISIBLE_DEVICES", "ROCR_VISIBLE_DEVICES",
+    "ONEAPI_DEVICE_SELECTOR", "NEURON_RT_VISIBLE_CORES",
+    "HABANA_VISIBLE_MODULES", "TPU_VISIBLE_CHIPS"
+})
+
+# Recently built configs, see `EngineArgs.create_engine_config`. Maps a
+# snapshot of the engine arguments to (whether VLLM_USE_V1 was set, use_v1,
+# updated fields, updated environment variables, config).
+_ENGINE_CONFIG_CACHE: LRUCache[Hashable,
+                               Tuple[bool, bool, Dict[str, Any],
+                                     Dict[str, str], VllmConfig]] = LRUCache(32)
+_ENGINE_CONFIG_CACHE_LOCK = threading.Lock()
+
 
 def nullable_str(val: str):
     if not val or val == "None":
@@ -54,6 +109,52 @@ def nullable_str(val: str):
     return val
 
 
+def nullable_float_tuple(val: str) -> Optional[Tuple[float, ...]]:
+    """Parse a comma-separated list of floats, e.g. `4,8`."""
+    if nullable_str(val) is None:
+        return None
+    try:
+        return tuple(float(item) for item in val.split(","))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"Expected comma-separated floats, but got {val!r}") from exc
+
+
+# orjson parses integers outside of the 64-bit range as floats, while json
+# keeps them exact. Such integers have at least 19 digits.
+_LONG_DIGIT_RUN = re.compile(r"\d{19}")
+
+
+def json_loads(val: str) -> Any:
+    """Same as `json.loads`, but uses the faster `orjson` if available."""
+    if orjson is not None and not _LONG_DIGIT_RUN.search(val):
+        try:
+            return orjson.loads(val)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than json, e.g. it rejects NaN and
+            # Infinity, so leave the final word to json
+            pass
+    return json.loads(val)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_regex(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern)
+
+
+def nullable_regex(val: str) -> Optional[str]:
+    """Same as `nullable_str`, but rejects invalid regexes when the
+    arguments are parsed rather than when they are first used."""
+    pattern = nullable_str(val)
+    if pattern is not None:
+        try:
+            _compile_regex(pattern)
+        except re.error as exc:
+            raise argparse.ArgumentTypeError(
+                f"Invalid regex {pattern!r}: {exc}") from exc
+    return pattern
+
+
 def nullable_kvs(val: str) -> Optional[Mapping[str, int]]:
     """Parses a string containing comma separate key [str] to value [int]
     pairs into a dictionary.
@@ -68,12 +169,19 @@ def nullable_kvs(val: str) -> Optional[Mapping[str, int]]:
         return None
 
     out_dict: Dict[str, int] = {}
-    for item in val.split(","):
-        kv_parts = [part.lower().strip() for part in item.split("=")]
-        if len(kv_parts) != 2:
+    # Scan the items in a single pass instead of splitting into lists
+    start, end = 0, len(val)
+    while start <= end:
+        stop = val.find(",", start)
+        if stop == -1:
+            stop = end
+
+        key, sep, value = val[start:stop].partition("=")
+        if not sep or "=" in value:
             raise argparse.ArgumentTypeError(
                 "Each item should be in the form KEY=VALUE")
-        key, value = kv_parts
+        key = key.strip().lower()
+        value = value.strip().lower()
 
         try:
             parsed_value = int(value)
@@ -81,14 +189,49 @@ def nullable_kvs(val: str) -> Optional[Mapping[str, int]]:
             msg = f"Failed to parse value of item {key}={value}"
             raise argparse.ArgumentTypeError(msg) from exc
 
-        if key in out_dict and out_dict[key] != parsed_value:
+        if out_dict.get(key, parsed_value) != parsed_value:
             raise argparse.ArgumentTypeError(
                 f"Conflicting values specified for key: {key}")
         out_dict[key] = parsed_value
+        start = stop + 1
 
     return out_dict
 
 
+@functools.lru_cache(maxsize=128)
+def _parse_nullable_kvs(val: str) -> Optional[Mapping[str, int]]:
+    return nullable_kvs(val)
+
+
+def _cached_nullable_kvs(val: str) -> Optional[Mapping[str, int]]:
+    """Same as `nullable_kvs`, but reuses the result for repeated values.
+
+    A copy is returned so that callers cannot modify the cached result.
+    """
+    kvs = _parse_nullable_kvs(val)
+    return None if kvs is None else dict(kvs)
+
+
+@functools.cache
+def _models_on_s3() -> FrozenSet[str]:
+    """The models that are loaded from S3 in CI, as a set to look the model
+    up in."""
+    return frozenset(MODELS_ON_S3)
+
+
+@functools.cache
+def _pre_register_platform() -> None:
+    """Run the platform's pre-registration hook (without a parser) once per
+    process, rather than for every engine config that is created."""
+    from vllm.platforms import current_platform
+    current_platform.pre_register_and_update()
+
+
+# NOTE: EngineArgs intentionally does not use `__slots__`. Its class
+# attributes double as the field defaults that the CLI
+# (`default=EngineArgs.<field>`) and the V1 oracle compare against, and a
+# slotted dataclass replaces them with member descriptors. Besides,
+# `dataclass(slots=True)` needs Python 3.10+.
 @dataclass
 class EngineArgs:
     """Arguments for vLLM engine."""
@@ -225,822 +368,79 @@ class EngineArgs:
             self.compilation_config = CompilationConfig.from_cli(
                 str(self.compilation_config))
 
+        # support `EngineArgs(long_lora_scaling_factors="4,8")` and any other
+        # sequence, LoRAConfig expects a tuple of floats
+        if isinstance(self.long_lora_scaling_factors, str):
+            self.long_lora_scaling_factors = tuple(
+                float(factor)
+                for factor in self.long_lora_scaling_factors.split(","))
+        elif self.long_lora_scaling_factors is not None:
+            self.long_lora_scaling_factors = tuple(
+                float(factor) for factor in self.long_lora_scaling_factors)
+
+        if self.logits_processor_pattern is not None:
+            try:
+                _compile_regex(self.logits_processor_pattern)
+            except re.error as exc:
+                raise ValueError(
+                    "Invalid logits processor pattern "
+                    f"{self.logits_processor_pattern!r}: {exc}") from exc
+
         # Setup plugins
-        from vllm.plugins import load_general_plugins
         load_general_plugins()
 
     @staticmethod
     def add_cli_args(parser: FlexibleArgumentParser) -> FlexibleArgumentParser:
         """Shared CLI arguments for vLLM engine."""
-        # Model arguments
-        parser.add_argument(
-            '--model',
-            type=str,
-            default=EngineArgs.model,
-            help='Name or path of the huggingface model to use.')
-        parser.add_argument(
-            '--task',
-            default=EngineArgs.task,
-            choices=get_args(TaskOption),
-            help='The task to use the model for. Each vLLM instance only '
-            'supports one task, even if the same model can be used for '
-            'multiple tasks. When the model only supports one task, ``"auto"`` '
-            'can be used to select it; otherwise, you must specify explicitly '
-            'which task to use.')
-        parser.add_argument(
-            '--tokenizer',
-            type=nullable_str,
-            default=EngineArgs.tokenizer,
-            help='Name or path of the huggingface tokenizer to use. '
-            'If unspecified, model name or path will be used.')
-        parser.add_argument(
-            "--hf-config-path",
-            type=nullable_str,
-            default=EngineArgs.hf_config_path,
-            help='Name or path of the huggingface config to use. '
-            'If unspecified, model name or path will be used.')
-        parser.add_argument(
-            '--skip-tokenizer-init',
-            action='store_true',
-            help='Skip initialization of tokenizer and detokenizer. '
-            'Expects valid prompt_token_ids and None for prompt from '
-            'the input. The generated output will contain token ids.')
-        parser.add_argument(
-            '--revision',
-            type=nullable_str,
-            default=None,
-            help='The specific model version to use. It can be a branch '
-            'name, a tag name, or a commit id. If unspecified, will use '
-            'the default version.')
-        parser.add_argument(
-            '--code-revision',
-            type=nullable_str,
-            default=None,
-            help='The specific revision to use for the model code on '
-            'Hugging Face Hub. It can be a branch name, a tag name, or a '
-            'commit id. If unspecified, will use the default version.')
-        parser.add_argument(
-            '--tokenizer-revision',
-            type=nullable_str,
-            default=None,
-            help='Revision of the huggingface tokenizer to use. '
-            'It can be a branch name, a tag name, or a commit id. '
-            'If unspecified, will use the default version.')
-        parser.add_argument(
-            '--tokenizer-mode',
-            type=str,
-            default=EngineArgs.tokenizer_mode,
-            choices=['auto', 'slow', 'mistral', 'custom'],
-            help='The tokenizer mode.\n\n* "auto" will use the '
-            'fast tokenizer if available.\n* "slow" will '
-            'always use the slow tokenizer. \n* '
-            '"mistral" will always use the `mistral_common` tokenizer. \n* '
-            '"custom" will use --tokenizer to select the '
-            'preregistered tokenizer.')
-        parser.add_argument('--trust-remote-code',
-                            action='store_true',
-                            help='Trust remote code from huggingface.')
-        parser.add_argument(
-            '--allowed-local-media-path',
-            type=str,
-            help="Allowing API requests to read local images or videos "
-            "from directories specified by the server file system. "
-            "This is a security risk. "
-            "Should only be enabled in trusted environments.")
-        parser.add_argument('--download-dir',
-                            type=nullable_str,
-                            default=EngineArgs.download_dir,
-                            help='Directory to download and load the weights.')
-        parser.add_argument(
-            '--load-format',
-            type=str,
-            default=EngineArgs.load_format,
-            choices=[f.value for f in LoadFormat],
-            help='The format of the model weights to load.\n\n'
-            '* "auto" will try to load the weights in the safetensors format '
-            'and fall back to the pytorch bin format if safetensors format '
-            'is not available.\n'
-            '* "pt" will load the weights in the pytorch bin format.\n'
-            '* "safetensors" will load the weights in the safetensors format.\n'
-            '* "npcache" will load the weights in pytorch format and store '
-            'a numpy cache to speed up the loading.\n'
-            '* "dummy" will initialize the weights with random values, '
-            'which is mainly for profiling.\n'
-            '* "tensorizer" will load the weights using tensorizer from '
-            'CoreWeave. See the Tensorize vLLM Model script in the Examples '
-            'section for more information.\n'
-            '* "runai_streamer" will load the Safetensors weights using Run:ai'
-            'Model Streamer.\n'
-            '* "bitsandbytes" will load the weights using bitsandbytes '
-            'quantization.\n'
-            '* "sharded_state" will load weights from pre-sharded checkpoint '
-            'files, supporting efficient loading of tensor-parallel models\n'
-            '* "gguf" will load weights from GGUF format files (details '
-            'specified in https://github.com/ggml-org/ggml/blob/master/docs/gguf.md).\n'
-            '* "mistral" will load weights from consolidated safetensors files '
-            'used by Mistral models.\n')
-        parser.add_argument(
-            '--config-format',
-            default=EngineArgs.config_format,
-            choices=[f.value for f in ConfigFormat],
-            help='The format of the model config to load.\n\n'
-            '* "auto" will try to load the config in hf format '
-            'if available else it will try to load in mistral format ')
-        parser.add_argument(
-            '--dtype',
-            type=str,
-            default=EngineArgs.dtype,
-            choices=[
-                'auto', 'half', 'float16', 'bfloat16', 'float', 'float32'
-            ],
-            help='Data type for model weights and activations.\n\n'
-            '* "auto" will use FP16 precision for FP32 and FP16 models, and '
-            'BF16 precision for BF16 models.\n'
-            '* "half" for FP16. Recommended for AWQ quantization.\n'
-            '* "float16" is the same as "half".\n'
-            '* "bfloat16" for a balance between precision and range.\n'
-            '* "float" is shorthand for FP32 precision.\n'
-            '* "float32" for FP32 precision.')
-        parser.add_argument(
-            '--kv-cache-dtype',
-            type=str,
-            choices=['auto', 'fp8', 'fp8_e5m2', 'fp8_e4m3'],
-            default=EngineArgs.kv_cache_dtype,
-            help='Data type for kv cache storage. If "auto", will use model '
-            'data type. CUDA 11.8+ supports fp8 (=fp8_e4m3) and fp8_e5m2. '
-            'ROCm (AMD GPU) supports fp8 (=fp8_e4m3)')
-        parser.add_argument('--max-model-len',
-                            type=human_readable_int,
-                            default=EngineArgs.max_model_len,
-                            help='Model context length. If unspecified, will '
-                            'be automatically derived from the model config. '
-                            'Supports k/m/g/K/M/G in human-readable format.\n'
-                            'Examples:\n'
-                            '- 1k → 1000\n'
-                            '- 1K → 1024\n')
-        parser.add_argument(
-            '--guided-decoding-backend',
-            type=str,
-            default='xgrammar',
-            help='Which engine will be used for guided decoding'
-            ' (JSON schema / regex etc) by default. Currently support '
-            'https://github.com/mlc-ai/xgrammar and '
-            'https://github.com/guidance-ai/llguidance.'
-            'Valid backend values are "xgrammar", "guidance", and "auto". '
-            'With "auto", we will make opinionated choices based on request'
-            'contents and what the backend libraries currently support, so '
-            'the behavior is subject to change in each release.')
-        parser.add_argument(
-            '--logits-processor-pattern',
-            type=nullable_str,
-            default=None,
-            help='Optional regex pattern specifying valid logits processor '
-            'qualified names that can be passed with the `logits_processors` '
-            'extra completion argument. Defaults to None, which allows no '
-            'processors.')
-        parser.add_argument(
-            '--model-impl',
-            type=str,
-            default=EngineArgs.model_impl,
-            choices=[f.value for f in ModelImpl],
-            help='Which implementation of the model to use.\n\n'
-            '* "auto" will try to use the vLLM implementation if it exists '
-            'and fall back to the Transformers implementation if no vLLM '
-            'implementation is available.\n'
-            '* "vllm" will use the vLLM model implementation.\n'
-            '* "transformers" will use the Transformers model '
-            'implementation.\n')
-        # Parallel arguments
-        parser.add_argument(
-            '--distributed-executor-backend',
-            choices=['ray', 'mp', 'uni', 'external_launcher'],
-            default=EngineArgs.distributed_executor_backend,
-            help='Backend to use for distributed model '
-            'workers, either "ray" or "mp" (multiprocessing). If the product '
-            'of pipeline_parallel_size and tensor_parallel_size is less than '
-            'or equal to the number of GPUs available, "mp" will be used to '
-            'keep processing on a single host. Otherwise, this will default '
-            'to "ray" if Ray is installed and fail otherwise. Note that tpu '
-            'only supports Ray for distributed inference.')
-
-        parser.add_argument('--pipeline-parallel-size',
-                            '-pp',
-                            type=int,
-                            default=EngineArgs.pipeline_parallel_size,
-                            help='Number of pipeline stages.')
-        parser.add_argument('--tensor-parallel-size',
-                            '-tp',
-                            type=int,
-                            default=EngineArgs.tensor_parallel_size,
-                            help='Number of tensor parallel replicas.')
-        parser.add_argument('--data-parallel-size',
-                            '-dp',
-                            type=int,
-                            default=EngineArgs.data_parallel_size,
-                            help='Number of data parallel replicas. '
-                            'MoE layers will be sharded according to the '
-                            'product of the tensor-parallel-size and '
-                            'data-parallel-size.')
-        parser.add_argument(
-            '--enable-expert-parallel',
-            action='store_true',
-            help='Use expert parallelism instead of tensor parallelism '
-            'for MoE layers.')
-        parser.add_argument(
-            '--max-parallel-loading-workers',
-            type=int,
-            default=EngineArgs.max_parallel_loading_workers,
-            help='Load model sequentially in multiple batches, '
-            'to avoid RAM OOM when using tensor '
-            'parallel and large models.')
-        parser.add_argument(
-            '--ray-workers-use-nsight',
-            action='store_true',
-            help='If specified, use nsight to profile Ray workers.')
-        # KV cache arguments
-        parser.add_argument('--block-size',
-                            type=int,
-                            default=EngineArgs.block_size,
-                            choices=[8, 16, 32, 64, 128],
-                            help='Token block size for contiguous chunks of '
-                            'tokens. This is ignored on neuron devices and '
-                            'set to ``--max-model-len``. On CUDA devices, '
-                            'only block sizes up to 32 are supported. '
-                            'On HPU devices, block size defaults to 128.')
-
-        parser.add_argument(
-            "--enable-prefix-caching",
-            action=argparse.BooleanOptionalAction,
-            default=EngineArgs.enable_prefix_caching,
-            help="Enables automatic prefix caching. "
-            "Use ``--no-enable-prefix-caching`` to disable explicitly.",
-        )
-        parser.add_argument(
-            "--prefix-caching-hash-algo",
-            type=str,
-            choices=["builtin", "sha256"],
-            default=EngineArgs.prefix_caching_hash_algo,
-            help="Set the hash algorithm for prefix caching. "
-            "Options are 'builtin' (Python's built-in hash) or 'sha256' "
-            "(collision resistant but with certain overheads).",
-        )
-        parser.add_argument('--disable-sliding-window',
-                            action='store_true',
-                            help='Disables sliding window, '
-                            'capping to sliding window size.')
-        parser.add_argument('--use-v2-block-manager',
-                            action='store_true',
-                            default=True,
-                            help='[DEPRECATED] block manager v1 has been '
-                            'removed and SelfAttnBlockSpaceManager (i.e. '
-                            'block manager v2) is now the default. '
-                            'Setting this flag to True or False'
-                            ' has no effect on vLLM behavior.')
-        parser.add_argument(
-            '--num-lookahead-slots',
-            type=int,
-            default=EngineArgs.num_lookahead_slots,
-            help='Experimental scheduling config necessary for '
-            'speculative decoding. This will be replaced by '
-            'speculative config in the future; it is present '
-            'to enable correctness tests until then.')
-
-        parser.add_argument('--seed',
-                            type=int,
-                            default=EngineArgs.seed,
-                            help='Random seed for operations.')
-        parser.add_argument('--swap-space',
-                            type=float,
-                            default=EngineArgs.swap_space,
-                            help='CPU swap space size (GiB) per GPU.')
-        parser.add_argument(
-            '--cpu-offload-gb',
-            type=float,
-            default=0,
-            help='The space in GiB to offload to CPU, per GPU. '
-            'Default is 0, which means no offloading. Intuitively, '
-            'this argument can be seen as a virtual way to increase '
-            'the GPU memory size. For example, if you have one 24 GB '
-            'GPU and set this to 10, virtually you can think of it as '
-            'a 34 GB GPU. Then you can load a 13B model with BF16 weight, '
-            'which requires at least 26GB GPU memory. Note that this '
-            'requires fast CPU-GPU interconnect, as part of the model is '
-            'loaded from CPU memory to GPU memory on the fly in each '
-            'model forward pass.')
-        parser.add_argument(
-            '--gpu-memory-utilization',
-            type=float,
-            default=EngineArgs.gpu_memory_utilization,
-            help='The fraction of GPU memory to be used for the model '
-            'executor, which can range from 0 to 1. For example, a value of '
-            '0.5 would imply 50%% GPU memory utilization. If unspecified, '
-            'will use the default value of 0.9. This is a per-instance '
-            'limit, and only applies to the current vLLM instance.'
-            'It does not matter if you have another vLLM instance running '
-            'on the same GPU. For example, if you have two vLLM instances '
-            'running on the same GPU, you can set the GPU memory utilization '
-            'to 0.5 for each instance.')
-        parser.add_argument(
-            '--num-gpu-blocks-override',
-            type=int,
-            default=None,
-            help='If specified, ignore GPU profiling result and use this number'
-            ' of GPU blocks. Used for testing preemption.')
-        parser.add_argument('--max-num-batched-tokens',
-                            type=int,
-                            default=EngineArgs.max_num_batched_tokens,
-                            help='Maximum number of batched tokens per '
-                            'iteration.')
-        parser.add_argument(
-            "--max-num-partial-prefills",
-            type=int,
-            default=EngineArgs.max_num_partial_prefills,
-            help="For chunked prefill, the max number of concurrent \
-            partial prefills.")
-        parser.add_argument(
-            "--max-long-partial-prefills",
-            type=int,
-            default=EngineArgs.max_long_partial_prefills,
-            help="For chunked prefill, the maximum number of prompts longer "
-            "than --long-prefill-token-threshold that will be prefilled "
-            "concurrently. Setting this less than --max-num-partial-prefills "
-            "will allow shorter prompts to jump the queue in front of longer "
-            "prompts in some cases, improving latency.")
-        parser.add_argument(
-            "--long-prefill-token-threshold",
-            type=float,
-            default=EngineArgs.long_prefill_token_threshold,
-            help="For chunked prefill, a request is considered long if the "
-            "prompt is longer than this number of tokens.")
-        parser.add_argument('--max-num-seqs',
-                            type=int,
-                            default=EngineArgs.max_num_seqs,
-                            help='Maximum number of sequences per iteration.')
-        parser.add_argument(
-            '--max-logprobs',
-            type=int,
-            default=EngineArgs.max_logprobs,
-            help=('Max number of log probs to return logprobs is specified in'
-                  ' SamplingParams.'))
-        parser.add_argument('--disable-log-stats',
-                            action='store_true',
-                            help='Disable logging statistics.')
-        # Quantization settings.
-        parser.add_argument('--quantization',
-                            '-q',
-                            type=nullable_str,
-                            choices=[*QUANTIZATION_METHODS, None],
-                            default=EngineArgs.quantization,
-                            help='Method used to quantize the weights. If '
-                            'None, we first check the `quantization_config` '
-                            'attribute in the model config file. If that is '
-                            'None, we assume the model weights are not '
-                            'quantized and use `dtype` to determine the data '
-                            'type of the weights.')
-        parser.add_argument(
-            '--rope-scaling',
-            default=None,
-            type=json.loads,
-            help='RoPE scaling configuration in JSON format. '
-            'For example, ``{"rope_type":"dynamic","factor":2.0}``')
-        parser.add_argument('--rope-theta',
-                            default=None,
-                            type=float,
-                            help='RoPE theta. Use with `rope_scaling`. In '
-                            'some cases, changing the RoPE theta improves the '
-                            'performance of the scaled model.')
-        parser.add_argument(
-            '--hf-token',
-            type=str,
-            nargs='?',
-            const=True,
-            default=None,
-            help='The token to use as HTTP bearer authorization'
-            ' for remote files. If `True`, will use the token '
-            'generated when running `huggingface-cli login` '
-            '(stored in `~/.huggingface`).')
-        parser.add_argument('--hf-overrides',
-                            type=json.loads,
-                            default=EngineArgs.hf_overrides,
-                            help='Extra arguments for the HuggingFace config. '
-                            'This should be a JSON string that will be '
-                            'parsed into a dictionary.')
-        parser.add_argument('--enforce-eager',
-                            action='store_true',
-                            help='Always use eager-mode PyTorch. If False, '
-                            'will use eager mode and CUDA graph in hybrid '
-                            'for maximal performance and flexibility.')
-        parser.add_argument('--max-seq-len-to-capture',
-                            type=int,
-                            default=EngineArgs.max_seq_len_to_capture,
-                            help='Maximum sequence length covered by CUDA '
-                            'graphs. When a sequence has context length '
-                            'larger than this, we fall back to eager mode. '
-                            'Additionally for encoder-decoder models, if the '
-                            'sequence length of the encoder input is larger '
-                            'than this, we fall back to the eager mode.')
-        parser.add_argument('--disable-custom-all-reduce',
-                            action='store_true',
-                            default=EngineArgs.disable_custom_all_reduce,
-                            help='See ParallelConfig.')
-        parser.add_argument('--tokenizer-pool-size',
-                            type=int,
-                            default=EngineArgs.tokenizer_pool_size,
-                            help='Size of tokenizer pool to use for '
-                            'asynchronous tokenization. If 0, will '
-                            'use synchronous tokenization.')
-        parser.add_argument('--tokenizer-pool-type',
-                            type=str,
-                            default=EngineArgs.tokenizer_pool_type,
-                            help='Type of tokenizer pool to use for '
-                            'asynchronous tokenization. Ignored '
-                            'if tokenizer_pool_size is 0.')
-        parser.add_argument('--tokenizer-pool-extra-config',
-                            type=nullable_str,
-                            default=EngineArgs.tokenizer_pool_extra_config,
-                            help='Extra config for tokenizer pool. '
-                            'This should be a JSON string that will be '
-                            'parsed into a dictionary. Ignored if '
-                            'tokenizer_pool_size is 0.')
-
-        # Multimodal related configs
-        parser.add_argument(
-            '--limit-mm-per-prompt',
-            type=nullable_kvs,
-            default=EngineArgs.limit_mm_per_prompt,
-            # The default value is given in
-            # MultiModalConfig.get_limit_per_prompt
-            help=('For each multimodal plugin, limit how many '
-                  'input instances to allow for each prompt. '
-                  'Expects a comma-separated list of items, '
-                  'e.g.: `image=16,video=2` allows a maximum of 16 '
-                  'images and 2 videos per prompt. Defaults to 1 for '
-                  'each modality.'))
-        parser.add_argument(
-            '--mm-processor-kwargs',
-            default=None,
-            type=json.loads,
-            help=('Overrides for the multimodal input mapping/processing, '
-                  'e.g., image processor. For example: ``{"num_crops": 4}``.'))
-        parser.add_argument(
-            '--disable-mm-preprocessor-cache',
-            action='store_true',
-            help='If true, then disables caching of the multi-modal '
-            'preprocessor/mapper. (not recommended)')
-
-        # LoRA related configs
-        parser.add_argument('--enable-lora',
-                            action='store_true',
-                            help='If True, enable handling of LoRA adapters.')
-        parser.add_argument('--enable-lora-bias',
-                            action='store_true',
-                            help='If True, enable bias for LoRA adapters.')
-        parser.add_argument('--max-loras',
-                            type=int,
-                            default=EngineArgs.max_loras,
-                            help='Max number of LoRAs in a single batch.')
-        parser.add_argument('--max-lora-rank',
-                            type=int,
-                            default=EngineArgs.max_lora_rank,
-                            help='Max LoRA rank.')
-        parser.add_argument(
-            '--lora-extra-vocab-size',
-            type=int,
-            default=EngineArgs.lora_extra_vocab_size,
-            help=('Maximum size of extra vocabulary that can be '
-                  'present in a LoRA adapter (added to the base '
-                  'model vocabulary).'))
-        parser.add_argument(
-            '--lora-dtype',
-            type=str,
-            default=EngineArgs.lora_dtype,
-            choices=['auto', 'float16', 'bfloat16'],
-            help=('Data type for LoRA. If auto, will default to '
-                  'base model dtype.'))
-        parser.add_argument(
-            '--long-lora-scaling-factors',
-            type=nullable_str,
-            default=EngineArgs.long_lora_scaling_factors,
-            help=('Specify multiple scaling factors (which can '
-                  'be different from base model scaling factor '
-                  '- see eg. Long LoRA) to allow for multiple '
-                  'LoRA adapters trained with those scaling '
-                  'factors to be used at the same time. If not '
-                  'specified, only adapters trained with the '
-                  'base model scaling factor are allowed.'))
-        parser.add_argument(
-            '--max-cpu-loras',
-            type=int,
-            default=EngineArgs.max_cpu_loras,
-            help=('Maximum number of LoRAs to store in CPU memory. '
-                  'Must be >= than max_loras.'))
-        parser.add_argument(
-            '--fully-sharded-loras',
-            action='store_true',
-            help=('By default, only half of the LoRA computation is '
-                  'sharded with tensor parallelism. '
-                  'Enabling this will use the fully sharded layers. '
-                  'At high sequence length, max rank or '
-                  'tensor parallel size, this is likely faster.'))
-        parser.add_argument('--enable-prompt-adapter',
-                            action='store_true',
-                            help='If True, enable handling of PromptAdapters.')
-        parser.add_argument('--max-prompt-adapters',
-                            type=int,
-                            default=EngineArgs.max_prompt_adapters,
-                            help='Max number of PromptAdapters in a batch.')
-        parser.add_argument('--max-prompt-adapter-token',
-                            type=int,
-                            default=EngineArgs.max_prompt_adapter_token,
-                            help='Max number of PromptAdapters tokens')
-        parser.add_argument("--device",
-                            type=str,
-                            default=EngineArgs.device,
-                            choices=DEVICE_OPTIONS,
-                            help='Device type for vLLM execution.')
-        parser.add_argument('--num-scheduler-steps',
-                            type=int,
-                            default=1,
-                            help=('Maximum number of forward steps per '
-                                  'scheduler call.'))
-        parser.add_argument(
-            '--use-tqdm-on-load',
-            dest='use_tqdm_on_load',
-            action=argparse.BooleanOptionalAction,
-            default=EngineArgs.use_tqdm_on_load,
-            help='Whether to enable/disable progress bar '
-            'when loading model weights.',
-        )
+        for title, add_args in _ENGINE_ARG_GROUPS:
+            _add_arg_group(parser, title, add_args)
+        return parser
 
-        parser.add_argument(
-            '--multi-step-stream-outputs',
-            action=StoreBoolean,
-            default=EngineArgs.multi_step_stream_outputs,
-            nargs="?",
-            const="True",
-            help='If False, then multi-step will stream outputs at the end '
-            'of all steps')
-        parser.add_argument(
-            '--scheduler-delay-factor',
-            type=float,
-            default=EngineArgs.scheduler_delay_factor,
-            help='Apply a delay (of delay factor multiplied by previous '
-            'prompt latency) before scheduling next prompt.')
-        parser.add_argument(
-            '--enable-chunked-prefill',
-            action=StoreBoolean,
-            default=EngineArgs.enable_chunked_prefill,
-            nargs="?",
-            const="True",
-            help='If set, the prefill requests can be chunked based on the '
-            'max_num_batched_tokens.')
-        parser.add_argument('--speculative-config',
-                            type=json.loads,
-                            default=None,
-                            help='The configurations for speculative decoding.'
-                            ' Should be a JSON string.')
-
-        parser.add_argument('--model-loader-extra-config',
-                            type=nullable_str,
-                            default=EngineArgs.model_loader_extra_config,
-                            help='Extra config for model loader. '
-                            'This will be passed to the model loader '
-                            'corresponding to the chosen load_format. '
-                            'This should be a JSON string that will be '
-                            'parsed into a dictionary.')
-        parser.add_argument(
-            '--ignore-patterns',
-            action="append",
-            type=str,
-            default=[],
-            help="The pattern(s) to ignore when loading the model."
-            "Default to `original/**/*` to avoid repeated loading of llama's "
-            "checkpoints.")
-        parser.add_argument(
-            '--preemption-mode',
-            type=str,
-            default=None,
-            help='If \'recompute\', the engine performs preemption by '
-            'recomputing; If \'swap\', the engine performs preemption by '
-            'block swapping.')
-
-        parser.add_argument(
-            "--served-model-name",
-            nargs="+",
-            type=str,
-            default=None,
-            help="The model name(s) used in the API. If multiple "
-            "names are provided, the server will respond to any "
-            "of the provided names. The model name in the model "
-            "field of a response will be the first name in this "
-            "list. If not specified, the model name will be the "
-            "same as the ``--model`` argument. Noted that this name(s) "
-            "will also be used in `model_name` tag content of "
-            "prometheus metrics, if multiple names provided, metrics "
-            "tag will take the first one.")
-        parser.add_argument('--qlora-adapter-name-or-path',
-                            type=str,
-                            default=None,
-                            help='Name or path of the QLoRA adapter.')
-
-        parser.add_argument('--show-hidden-metrics-for-version',
-                            type=str,
-                            default=None,
-                            help='Enable deprecated Prometheus metrics that '
-                            'have been hidden since the specified version. '
-                            'For example, if a previously deprecated metric '
-                            'has been hidden since the v0.7.0 release, you '
-                            'use --show-hidden-metrics-for-version=0.7 as a '
-                            'temporary escape hatch while you migrate to new '
-                            'metrics. The metric is likely to be removed '
-                            'completely in an upcoming release.')
-
-        parser.add_argument(
-            '--otlp-traces-endpoint',
-            type=str,
-            default=None,
-            help='Target URL to which OpenTelemetry traces will be sent.')
-        parser.add_argument(
-            '--collect-detailed-traces',
-            type=str,
-            default=None,
-            help="Valid choices are " +
-            ",".join(ALLOWED_DETAILED_TRACE_MODULES) +
-            ". It makes sense to set this only if ``--otlp-traces-endpoint`` is"
-            " set. If set, it will collect detailed traces for the specified "
-            "modules. This involves use of possibly costly and or blocking "
-            "operations and hence might have a performance impact.")
-
-        parser.add_argument(
-            '--disable-async-output-proc',
-            action='store_true',
-            default=EngineArgs.disable_async_output_proc,
-            help="Disable async output processing. This may result in "
-            "lower performance.")
-
-        parser.add_argument(
-            '--scheduling-policy',
-            choices=['fcfs', 'priority'],
-            default="fcfs",
-            help='The scheduling policy to use. "fcfs" (first come first served'
-            ', i.e. requests are handled in order of arrival; default) '
-            'or "priority" (requests are handled based on given '
-            'priority (lower value means earlier handling) and time of '
-            'arrival deciding any ties).')
-
-        parser.add_argument(
-            '--scheduler-cls',
-            default=EngineArgs.scheduler_cls,
-            help='The scheduler class to use. "vllm.core.scheduler.Scheduler" '
-            'is the default scheduler. Can be a class directly or the path to '
-            'a class of form "mod.custom_class".')
-
-        parser.add_argument(
-            '--override-neuron-config',
-            type=json.loads,
-            default=None,
-            help="Override or set neuron device configuration. "
-            "e.g. ``{\"cast_logits_dtype\": \"bloat16\"}``.")
-        parser.add_argument(
-            '--override-pooler-config',
-            type=PoolerConfig.from_json,
-            default=None,
-            help="Override or set the pooling method for pooling models. "
-            "e.g. ``{\"pooling_type\": \"mean\", \"normalize\": false}``.")
-
-        parser.add_argument('--compilation-config',
-                            '-O',
-                            type=CompilationConfig.from_cli,
-                            default=None,
-                            help='torch.compile configuration for the model.'
-                            'When it is a number (0, 1, 2, 3), it will be '
-                            'interpreted as the optimization level.\n'
-                            'NOTE: level 0 is the default level without '
-                            'any optimization. level 1 and 2 are for internal '
-                            'testing only. level 3 is the recommended level '
-                            'for production.\n'
-                            'To specify the full compilation config, '
-                            'use a JSON string.\n'
-                            'Following the convention of traditional '
-                            'compilers, using -O without space is also '
-                            'supported. -O3 is equivalent to -O 3.')
-
-        parser.add_argument('--kv-transfer-config',
-                            type=KVTransferConfig.from_cli,
-                            default=None,
-                            help='The configurations for distributed KV cache '
-                            'transfer. Should be a JSON string.')
-
-        parser.add_argument(
-            '--worker-cls',
-            type=str,
-            default="auto",
-            help='The worker class to use for distributed execution.')
-        parser.add_argument(
-            '--worker-extension-cls',
-            type=str,
-            default="",
-            help='The worker extension class on top of the worker cls, '
-            'it is useful if you just want to add new functions to the worker '
-            'class without changing the existing functions.')
-        parser.add_argument(
-            "--generation-config",
-            type=nullable_str,
-            default="auto",
-            help="The folder path to the generation config. "
-            "Defaults to 'auto', the generation config will be loaded from "
-            "model path. If set to 'vllm', no generation config is loaded, "
-            "vLLM defaults will be used. If set to a folder path, the "
-            "generation config will be loaded from the specified folder path. "
-            "If `max_new_tokens` is specified in generation config, then "
-            "it sets a server-wide limit on the number of output tokens "
-            "for all requests.")
-
-        parser.add_argument(
-            "--override-generation-config",
-            type=json.loads,
-            default=None,
-            help="Overrides or sets generation config in JSON format. "
-            "e.g. ``{\"temperature\": 0.5}``. If used with "
-            "--generation-config=auto, the override parameters will be merged "
-            "with the default config from the model. If generation-config is "
-            "None, only the override parameters are used.")
-
-        parser.add_argument("--enable-sleep-mode",
-                            action="store_true",
-                            default=False,
-                            help="Enable sleep mode for the engine. "
-                            "(only cuda platform is supported)")
-
-        parser.add_argument(
-            '--calculate-kv-scales',
-            action='store_true',
-            help='This enables dynamic calculation of '
-            'k_scale and v_scale when kv-cache-dtype is fp8. '
-            'If calculate-kv-scales is false, the scales will '
-            'be loaded from the model checkpoint if available. '
-            'Otherwise, the scales will default to 1.0.')
-
-        parser.add_argument(
-            "--additional-config",
-            type=json.loads,
-            default=None,
-            help="Additional config for specified platform in JSON format. "
-            "Different platforms may support different configs. Make sure the "
-            "configs are valid for the platform you are using. The input format"
-            " is like '{\"config_key\":\"config_value\"}'")
-
-        parser.add_argument(
-            "--enable-reasoning",
-            action="store_true",
-            default=False,
-            help="Whether to enable reasoning_content for the model. "
-            "If enabled, the model will be able to generate reasoning content."
-        )
+    @classmethod
+    @functools.cache
+    def _dataclass_fields(cls) -> Tuple[dataclasses.Field, ...]:
+        """`dataclasses.fields(cls)`, computed once per class.
 
-        parser.add_argument(
-            "--reasoning-parser",
-            type=str,
-            choices=list(ReasoningParserManager.reasoning_parsers),
-            default=None,
-            help=
-            "Select the reasoning parser depending on the model that you're "
-            "using. This is used to parse the reasoning content into OpenAI "
-            "API format. Required for ``--enable-reasoning``.")
-
-        parser.add_argument(
-            "--disable-cascade-attn",
-            action="store_true",
-            default=False,
-            help="Disable cascade attention for V1. While cascade attention "
-            "does not change the mathematical correctness, disabling it "
-            "could be useful for preventing potential numerical issues. "
-            "Note that even if this is set to False, cascade attention will be "
-            "only used when the heuristic tells that it's beneficial.")
-
-        parser.add_argument(
-            "--disable-chunked-mm-input",
-            action=StoreBoolean,
-            default=EngineArgs.disable_chunked_mm_input,
-            nargs="?",
-            const="False",
-            help="Disable multimodal input chunking attention for V1. "
-            "If set to true and chunked prefill is enabled, we do not want to"
-            " partially schedule a multimodal item. This ensures that if a "
-            "request has a mixed prompt (like text tokens TTTT followed by "
-            "image tokens IIIIIIIIII) where only some image tokens can be "
-            "scheduled (like TTTTIIIII, leaving IIIII), it will be scheduled "
-            "as TTTT in one step and IIIIIIIIII in the next.")
+        This can't be done when the class is created, since the dataclass
+        fields only exist once `@dataclass` has processed the class.
+        """
+        return dataclasses.fields(cls)
 
-        return parser
+    @classmethod
+    @functools.cache
+    def _field_names(cls) -> Tuple[str, ...]:
+        """The names of the dataclass fields, computed once per class."""
+        return tuple(field.name for field in cls._dataclass_fields())
 
     @classmethod
     def from_cli_args(cls, args: argparse.Namespace):
-        # Get the list of attributes of this dataclass.
-        attrs = [attr.name for attr in dataclasses.fields(cls)]
-        # Set the attributes from the parsed arguments.
-        engine_args = cls(**{attr: getattr(args, attr) for attr in attrs})
-        return engine_args
+        """Create the engine arguments from arguments parsed by a parser
+        that `add_cli_args` was applied to. Attributes of `args` that are
+        not engine arguments are ignored.
+
+        This is meant for CLI entry points. In-process callers should use
+        `from_dict` instead, which doesn't need a parser.
+        """
+        # Set the attributes of this dataclass from the parsed arguments.
+        return cls(**{name: getattr(args, name) for name in cls._field_names()})
+
+    @classmethod
+    def from_dict(cls, args: Mapping[str, Any]):
+        """Create the engine arguments from a mapping of field names to
+        values, without going through argparse.
+
+        This is the recommended entry point for in-process callers, e.g.
+        configuration dicts merged from files. `add_cli_args` and
+        `from_cli_args` are only needed for CLI callers.
+
+        Fields missing from `args` keep their defaults. Raises `ValueError`
+        if `args` has keys that are not engine arguments.
+        """
+        unknown_keys = args.keys() - set(cls._field_names())
+        if unknown_keys:
+            raise ValueError(
+                f"Unknown engine arguments: {sorted(unknown_keys)}")
+        return cls(**args)
 
     def create_model_config(self) -> ModelConfig:
         # gguf file needs a specific model loader and doesn't use hf_repo
@@ -1049,7 +449,7 @@ class EngineArgs:
 
         # NOTE: This is to allow model loading from S3 in CI
         if (not isinstance(self, AsyncEngineArgs) and envs.VLLM_CI_USE_S3
-                and self.model in MODELS_ON_S3
+                and self.model in _models_on_s3()
                 and self.load_format == LoadFormat.AUTO):  # noqa: E501
             self.model = f"{MODEL_WEIGHTS_S3_BUCKET}/{self.model}"
             self.load_format = LoadFormat.RUNAI_STREAMER
@@ -1161,10 +561,119 @@ class EngineArgs:
 
         If VLLM_USE_V1 is specified by the user but the VllmConfig
         is incompatible, we raise an error.
+
+        With VLLM_MEMOIZE_ENGINE_CONFIG=1, configs are memoized by a
+        snapshot of the engine arguments and of the environment they are
+        built in, so identical engine arguments reuse a copy of the config
+        built before (and get the same updates to their fields and to the
+        environment). Reused configs don't repeat the warnings logged while
+        building them.
         """
+        _pre_register_platform()
+
+        key = self._engine_config_cache_key(usage_context)
+        if key is None:
+            return self._create_engine_config(usage_context)
+
+        with _ENGINE_CONFIG_CACHE_LOCK:
+            cached = _ENGINE_CONFIG_CACHE.get(key)
+        if cached is not None:
+            use_v1_was_set, use_v1, updated_fields, updated_env, config = (
+                cached)
+            # The V1 oracle decides differently depending on whether
+            # VLLM_USE_V1 is set, so only reuse configs that it would
+            # decide the same way for.
+            if envs.is_set("VLLM_USE_V1"):
+                reuse = envs.VLLM_USE_V1 == use_v1
+            else:
+                reuse = not use_v1_was_set
+                if reuse:
+                    envs.set_vllm_use_v1(use_v1)
+            if reuse:
+                for name, value in copy.deepcopy(updated_fields).items():
+                    setattr(self, name, value)
+                # E.g. platforms set up threading variables for the config.
+                os.environ.update(updated_env)
+                config = copy.deepcopy(config)
+                config.instance_id = random_uuid()[:5]
+                return config
+
+        use_v1_was_set = envs.is_set("VLLM_USE_V1")
+        environ = dict(os.environ)
+        config = self._create_engine_config(usage_context)
+        updated_env = {
+            k: v
+            for k, v in os.environ.items()
+            if environ.get(k) != v and k != "VLLM_USE_V1"
+        }
+
+        # The frozen field values, see `_engine_config_cache_key`.
+        snapshot = key[2]
+        try:
+            updated_fields = {
+                f.name: getattr(self, f.name)
+                for f, frozen in zip(self._dataclass_fields(), snapshot)
+                if _freeze(getattr(self, f.name)) != frozen
+            }
+            entry = (use_v1_was_set, envs.VLLM_USE_V1,
+                     copy.deepcopy(updated_fields), updated_env,
+                     copy.deepcopy(config))
+            with _ENGINE_CONFIG_CACHE_LOCK:
+                _ENGINE_CONFIG_CACHE[key] = entry
+        except TypeError:
+            # Not copyable, don't memoize it.
+            pass
+
+        return config
+
+    def _engine_config_cache_key(
+            self, usage_context: Optional[UsageContext]) -> Optional[Hashable]:
+        """The key of the config built by `create_engine_config` in
+        `_ENGINE_CONFIG_CACHE`, or None if it should not be memoized."""
+        if not envs.VLLM_MEMOIZE_ENGINE_CONFIG:
+            return None
+        # The speculative config is built from objects created along the
+        # way, and Ray actors pass on their current placement group.
+        if self.speculative_config is not None or is_in_ray_actor():
+            return None
+        # Data parallel configs get a new open port each time, and the
+        # distributed executor backend depends on the Ray state.
+        if (self.data_parallel_size > 1 or
+                self.tensor_parallel_size * self.pipeline_parallel_size > 1):
+            return None
+        # The contents of a local model directory may change.
+        if os.path.exists(self.model):
+            return None
+
         from vllm.platforms import current_platform
-        current_platform.pre_register_and_update()
+        env_vars = _DEVICE_CONTROL_ENV_VARS | {
+            current_platform.device_control_env_var
+        }
+        try:
+            key = (
+                type(self),
+                usage_context,
+                tuple(
+                    _freeze(getattr(self, f.name))
+                    for f in self._dataclass_fields()),
+                tuple(
+                    sorted((k, v) for k, v in os.environ.items()
+                           if (k.startswith(_ENGINE_CONFIG_ENV_PREFIXES)
+                               or k in env_vars) and k != "VLLM_USE_V1")),
+                # Relative model paths are resolved against it.
+                os.getcwd(),
+                # The V1 oracle checks for it.
+                threading.current_thread() is threading.main_thread(),
+            )
+            hash(key)
+        except TypeError:
+            return None
+        return key
 
+    def _create_engine_config(
+        self,
+        usage_context: Optional[UsageContext] = None,
+    ) -> VllmConfig:
         device_config = DeviceConfig(device=self.device)
         model_config = self.create_model_config()
 
@@ -1431,9 +940,10 @@ class EngineArgs:
         # or if the device capability is not available
         # (e.g. in a Ray actor without GPUs).
         from vllm.platforms import current_platform
-        if (current_platform.is_cuda()
-                and current_platform.get_device_capability()
-                and current_platform.get_device_capability().major < 8):
+        # Only probe the device once, this may go through NVML.
+        capability = (current_platform.get_device_capability()
+                      if current_platform.is_cuda() else None)
+        if capability and capability.major < 8:
             _raise_or_fallback(feature_name="Compute Capability < 8.0",
                                recommend_to_remove=False)
             return False
@@ -1730,10 +1240,955 @@ class AsyncEngineArgs(EngineArgs):
                             action='store_true',
                             help='Disable logging requests.')
         from vllm.platforms import current_platform
-        current_platform.pre_register_and_update(parser)
+        if isinstance(parser, FlexibleArgumentParser):
+            # The platform may update the engine arguments, so this has to
+            # wait until they are actually added to the parser.
+            parser.add_lazy_arguments(current_platform.pre_register_and_update)
+        else:
+            current_platform.pre_register_and_update(parser)
         return parser
 
 
+def _add_model_args(parser: argparse._ActionsContainer) -> None:
+    """Model arguments."""
+    parser.add_argument(
+        '--model',
+        type=str,
+        default=EngineArgs.model,
+        help='Name or path of the huggingface model to use.')
+    parser.add_argument(
+        '--task',
+        default=EngineArgs.task,
+        choices=_TASK_CHOICES,
+        help='The task to use the model for. Each vLLM instance only '
+        'supports one task, even if the same model can be used for '
+        'multiple tasks. When the model only supports one task, ``"auto"`` '
+        'can be used to select it; otherwise, you must specify explicitly '
+        'which task to use.')
+    parser.add_argument(
+        '--tokenizer-mode',
+        type=sys.intern,
+        default=EngineArgs.tokenizer_mode,
+        choices=_TOKENIZER_MODE_CHOICES,
+        help='The tokenizer mode.\n\n* "auto" will use the '
+        'fast tokenizer if available.\n* "slow" will '
+        'always use the slow tokenizer. \n* '
+        '"mistral" will always use the `mistral_common` tokenizer. \n* '
+        '"custom" will use --tokenizer to select the '
+        'preregistered tokenizer.')
+    parser.add_argument(
+        '--allowed-local-media-path',
+        type=str,
+        help="Allowing API requests to read local images or videos "
+        "from directories specified by the server file system. "
+        "This is a security risk. "
+        "Should only be enabled in trusted environments.")
+    parser.add_argument(
+        '--config-format',
+        default=EngineArgs.config_format,
+        choices=_CONFIG_FORMAT_CHOICES,
+        help='The format of the model config to load.\n\n'
+        '* "auto" will try to load the config in hf format '
+        'if available else it will try to load in mistral format ')
+    parser.add_argument(
+        '--dtype',
+        type=sys.intern,
+        default=EngineArgs.dtype,
+        choices=_DTYPE_CHOICES,
+        help='Data type for model weights and activations.\n\n'
+        '* "auto" will use FP16 precision for FP32 and FP16 models, and '
+        'BF16 precision for BF16 models.\n'
+        '* "half" for FP16. Recommended for AWQ quantization.\n'
+        '* "float16" is the same as "half".\n'
+        '* "bfloat16" for a balance between precision and range.\n'
+        '* "float" is shorthand for FP32 precision.\n'
+        '* "float32" for FP32 precision.')
+    parser.add_argument('--max-model-len',
+                        type=human_readable_int,
+                        default=EngineArgs.max_model_len,
+                        help='Model context length. If unspecified, will '
+                        'be automatically derived from the model config. '
+                        'Supports k/m/g/K/M/G in human-readable format.\n'
+                        'Examples:\n'
+                        '- 1k → 1000\n'
+                        '- 1K → 1024\n')
+    parser.add_argument(
+        '--model-impl',
+        type=sys.intern,
+        default=EngineArgs.model_impl,
+        choices=_MODEL_IMPL_CHOICES,
+        help='Which implementation of the model to use.\n\n'
+        '* "auto" will try to use the vLLM implementation if it exists '
+        'and fall back to the Transformers implementation if no vLLM '
+        'implementation is available.\n'
+        '* "vllm" will use the vLLM model implementation.\n'
+        '* "transformers" will use the Transformers model '
+        'implementation.\n')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=EngineArgs.seed,
+                        help='Random seed for operations.')
+    parser.add_argument(
+        '--max-logprobs',
+        type=int,
+        default=EngineArgs.max_logprobs,
+        help=('Max number of log probs to return logprobs is specified in'
+              ' SamplingParams.'))
+    parser.add_argument(
+        '--rope-scaling',
+        default=None,
+        type=json_loads,
+        help='RoPE scaling configuration in JSON format. '
+        'For example, ``{"rope_type":"dynamic","factor":2.0}``')
+    parser.add_argument('--rope-theta',
+                        default=None,
+                        type=float,
+                        help='RoPE theta. Use with `rope_scaling`. In '
+                        'some cases, changing the RoPE theta improves the '
+                        'performance of the scaled model.')
+    parser.add_argument(
+        '--hf-token',
+        type=str,
+        nargs='?',
+        const=True,
+        default=None,
+        help='The token to use as HTTP bearer authorization'
+        ' for remote files. If `True`, will use the token '
+        'generated when running `huggingface-cli login` '
+        '(stored in `~/.huggingface`).')
+    parser.add_argument('--hf-overrides',
+                        type=json_loads,
+                        default=EngineArgs.hf_overrides,
+                        help='Extra arguments for the HuggingFace config. '
+                        'This should be a JSON string that will be '
+                        'parsed into a dictionary.')
+    parser.add_argument('--max-seq-len-to-capture',
+                        type=int,
+                        default=EngineArgs.max_seq_len_to_capture,
+                        help='Maximum sequence length covered by CUDA '
+                        'graphs. When a sequence has context length '
+                        'larger than this, we fall back to eager mode. '
+                        'Additionally for encoder-decoder models, if the '
+                        'sequence length of the encoder input is larger '
+                        'than this, we fall back to the eager mode.')
+    parser.add_argument(
+        "--served-model-name",
+        nargs="+",
+        type=str,
+        default=None,
+        help="The model name(s) used in the API. If multiple "
+        "names are provided, the server will respond to any "
+        "of the provided names. The model name in the model "
+        "field of a response will be the first name in this "
+        "list. If not specified, the model name will be the "
+        "same as the ``--model`` argument. Noted that this name(s) "
+        "will also be used in `model_name` tag content of "
+        "prometheus metrics, if multiple names provided, metrics "
+        "tag will take the first one.")
+    parser.add_argument(
+        '--override-neuron-config',
+        type=json_loads,
+        default=None,
+        help="Override or set neuron device configuration. "
+        "e.g. ``{\"cast_logits_dtype\": \"bloat16\"}``.")
+    parser.add_argument(
+        '--override-pooler-config',
+        type=PoolerConfig.from_json,
+        default=None,
+        help="Override or set the pooling method for pooling models. "
+        "e.g. ``{\"pooling_type\": \"mean\", \"normalize\": false}``.")
+    parser.add_argument(
+        "--override-generation-config",
+        type=json_loads,
+        default=None,
+        help="Overrides or sets generation config in JSON format. "
+        "e.g. ``{\"temperature\": 0.5}``. If used with "
+        "--generation-config=auto, the override parameters will be merged "
+        "with the default config from the model. If generation-config is "
+        "None, only the override parameters are used.")
+    parser.add_argument(
+        '--logits-processor-pattern',
+        type=nullable_regex,
+        default=None,
+        help='Optional regex pattern specifying valid logits processor '
+        'qualified names that can be passed with the `logits_processors` '
+        'extra completion argument. Defaults to None, which allows no '
+        'processors.')
+
+
+def _add_load_args(parser: argparse._ActionsContainer) -> None:
+    """Model loading arguments."""
+    parser.add_argument(
+        '--load-format',
+        type=sys.intern,
+        default=EngineArgs.load_format,
+        choices=_LOAD_FORMAT_CHOICES,
+        help='The format of the model weights to load.\n\n'
+        '* "auto" will try to load the weights in the safetensors format '
+        'and fall back to the pytorch bin format if safetensors format '
+        'is not available.\n'
+        '* "pt" will load the weights in the pytorch bin format.\n'
+        '* "safetensors" will load the weights in the safetensors format.\n'
+        '* "npcache" will load the weights in pytorch format and store '
+        'a numpy cache to speed up the loading.\n'
+        '* "dummy" will initialize the weights with random values, '
+        'which is mainly for profiling.\n'
+        '* "tensorizer" will load the weights using tensorizer from '
+        'CoreWeave. See the Tensorize vLLM Model script in the Examples '
+        'section for more information.\n'
+        '* "runai_streamer" will load the Safetensors weights using Run:ai'
+        'Model Streamer.\n'
+        '* "bitsandbytes" will load the weights using bitsandbytes '
+        'quantization.\n'
+        '* "sharded_state" will load weights from pre-sharded checkpoint '
+        'files, supporting efficient loading of tensor-parallel models\n'
+        '* "gguf" will load weights from GGUF format files (details '
+        'specified in https://github.com/ggml-org/ggml/blob/master/docs/gguf.md).\n'
+        '* "mistral" will load weights from consolidated safetensors files '
+        'used by Mistral models.\n')
+    parser.add_argument(
+        '--ignore-patterns',
+        action="append",
+        type=str,
+        # Not `[]`: the copies of this action in every parser would share it
+        # (see `_arg_group_actions`), and LoadConfig treats None the same.
+        default=EngineArgs.ignore_patterns,
+        help="The pattern(s) to ignore when loading the model."
+        "Default to `original/**/*` to avoid repeated loading of llama's "
+        "checkpoints.")
+    parser.add_argument(
+        '--use-tqdm-on-load',
+        dest='use_tqdm_on_load',
+        action=argparse.BooleanOptionalAction,
+        default=EngineArgs.use_tqdm_on_load,
+        help='Whether to enable/disable progress bar '
+        'when loading model weights.',
+    )
+    parser.add_argument('--qlora-adapter-name-or-path',
+                        type=str,
+                        default=None,
+                        help='Name or path of the QLoRA adapter.')
+
+
+def _add_parallel_args(parser: argparse._ActionsContainer) -> None:
+    """Distributed execution and tokenizer pool arguments."""
+    parser.add_argument(
+        '--distributed-executor-backend',
+        type=sys.intern,
+        choices=_DISTRIBUTED_EXECUTOR_BACKEND_CHOICES,
+        default=EngineArgs.distributed_executor_backend,
+        help='Backend to use for distributed model '
+        'workers, either "ray" or "mp" (multiprocessing). If the product '
+        'of pipeline_parallel_size and tensor_parallel_size is less than '
+        'or equal to the number of GPUs available, "mp" will be used to '
+        'keep processing on a single host. Otherwise, this will default '
+        'to "ray" if Ray is installed and fail otherwise. Note that tpu '
+        'only supports Ray for distributed inference.')
+    parser.add_argument('--pipeline-parallel-size',
+                        '-pp',
+                        type=int,
+                        default=EngineArgs.pipeline_parallel_size,
+                        help='Number of pipeline stages.')
+    parser.add_argument('--tensor-parallel-size',
+                        '-tp',
+                        type=int,
+                        default=EngineArgs.tensor_parallel_size,
+                        help='Number of tensor parallel replicas.')
+    parser.add_argument('--data-parallel-size',
+                        '-dp',
+                        type=int,
+                        default=EngineArgs.data_parallel_size,
+                        help='Number of data parallel replicas. '
+                        'MoE layers will be sharded according to the '
+                        'product of the tensor-parallel-size and '
+                        'data-parallel-size.')
+    parser.add_argument(
+        '--max-parallel-loading-workers',
+        type=int,
+        default=EngineArgs.max_parallel_loading_workers,
+        help='Load model sequentially in multiple batches, '
+        'to avoid RAM OOM when using tensor '
+        'parallel and large models.')
+    parser.add_argument('--tokenizer-pool-size',
+                        type=int,
+                        default=EngineArgs.tokenizer_pool_size,
+                        help='Size of tokenizer pool to use for '
+                        'asynchronous tokenization. If 0, will '
+                        'use synchronous tokenization.')
+    parser.add_argument('--tokenizer-pool-type',
+                        type=str,
+                        default=EngineArgs.tokenizer_pool_type,
+                        help='Type of tokenizer pool to use for '
+                        'asynchronous tokenization. Ignored '
+                        'if tokenizer_pool_size is 0.')
+    parser.add_argument(
+        '--worker-cls',
+        type=str,
+        default="auto",
+        help='The worker class to use for distributed execution.')
+    parser.add_argument(
+        '--worker-extension-cls',
+        type=str,
+        default="",
+        help='The worker extension class on top of the worker cls, '
+        'it is useful if you just want to add new functions to the worker '
+        'class without changing the existing functions.')
+
+
+def _add_kv_cache_args(parser: argparse._ActionsContainer) -> None:
+    """KV cache arguments."""
+    parser.add_argument('--block-size',
+                        type=int,
+                        default=EngineArgs.block_size,
+                        choices=_BLOCK_SIZE_CHOICES,
+                        help='Token block size for contiguous chunks of '
+                        'tokens. This is ignored on neuron devices and '
+                        'set to ``--max-model-len``. On CUDA devices, '
+                        'only block sizes up to 32 are supported. '
+                        'On HPU devices, block size defaults to 128.')
+    parser.add_argument(
+        "--enable-prefix-caching",
+        action=argparse.BooleanOptionalAction,
+        default=EngineArgs.enable_prefix_caching,
+        help="Enables automatic prefix caching. "
+        "Use ``--no-enable-prefix-caching`` to disable explicitly.",
+    )
+    parser.add_argument(
+        "--prefix-caching-hash-algo",
+        type=sys.intern,
+        choices=_PREFIX_CACHING_HASH_ALGO_CHOICES,
+        default=EngineArgs.prefix_caching_hash_algo,
+        help="Set the hash algorithm for prefix caching. "
+        "Options are 'builtin' (Python's built-in hash) or 'sha256' "
+        "(collision resistant but with certain overheads).",
+    )
+    parser.add_argument('--swap-space',
+                        type=float,
+                        default=EngineArgs.swap_space,
+                        help='CPU swap space size (GiB) per GPU.')
+    parser.add_argument(
+        '--cpu-offload-gb',
+        type=float,
+        default=0,
+        help='The space in GiB to offload to CPU, per GPU. '
+        'Default is 0, which means no offloading. Intuitively, '
+        'this argument can be seen as a virtual way to increase '
+        'the GPU memory size. For example, if you have one 24 GB '
+        'GPU and set this to 10, virtually you can think of it as '
+        'a 34 GB GPU. Then you can load a 13B model with BF16 weight, '
+        'which requires at least 26GB GPU memory. Note that this '
+        'requires fast CPU-GPU interconnect, as part of the model is '
+        'loaded from CPU memory to GPU memory on the fly in each '
+        'model forward pass.')
+    parser.add_argument(
+        '--gpu-memory-utilization',
+        type=float,
+        default=EngineArgs.gpu_memory_utilization,
+        help='The fraction of GPU memory to be used for the model '
+        'executor, which can range from 0 to 1. For example, a value of '
+        '0.5 would imply 50%% GPU memory utilization. If unspecified, '
+        'will use the default value of 0.9. This is a per-instance '
+        'limit, and only applies to the current vLLM instance.'
+        'It does not matter if you have another vLLM instance running '
+        'on the same GPU. For example, if you have two vLLM instances '
+        'running on the same GPU, you can set the GPU memory utilization '
+        'to 0.5 for each instance.')
+    parser.add_argument(
+        '--num-gpu-blocks-override',
+        type=int,
+        default=None,
+        help='If specified, ignore GPU profiling result and use this number'
+        ' of GPU blocks. Used for testing preemption.')
+    parser.add_argument(
+        '--kv-cache-dtype',
+        type=sys.intern,
+        choices=_KV_CACHE_DTYPE_CHOICES,
+        default=EngineArgs.kv_cache_dtype,
+        help='Data type for kv cache storage. If "auto", will use model '
+        'data type. CUDA 11.8+ supports fp8 (=fp8_e4m3) and fp8_e5m2. '
+        'ROCm (AMD GPU) supports fp8 (=fp8_e4m3)')
+
+
+def _add_scheduler_args(parser: argparse._ActionsContainer) -> None:
+    """Scheduler arguments."""
+    parser.add_argument('--max-num-batched-tokens',
+                        type=int,
+                        default=EngineArgs.max_num_batched_tokens,
+                        help='Maximum number of batched tokens per '
+                        'iteration.')
+    parser.add_argument(
+        "--max-num-partial-prefills",
+        type=int,
+        default=EngineArgs.max_num_partial_prefills,
+        help="For chunked prefill, the max number of concurrent \
+        partial prefills.")
+    parser.add_argument(
+        "--max-long-partial-prefills",
+        type=int,
+        default=EngineArgs.max_long_partial_prefills,
+        help="For chunked prefill, the maximum number of prompts longer "
+        "than --long-prefill-token-threshold that will be prefilled "
+        "concurrently. Setting this less than --max-num-partial-prefills "
+        "will allow shorter prompts to jump the queue in front of longer "
+        "prompts in some cases, improving latency.")
+    parser.add_argument(
+        "--long-prefill-token-threshold",
+        type=float,
+        default=EngineArgs.long_prefill_token_threshold,
+        help="For chunked prefill, a request is considered long if the "
+        "prompt is longer than this number of tokens.")
+    parser.add_argument('--max-num-seqs',
+                        type=int,
+                        default=EngineArgs.max_num_seqs,
+                        help='Maximum number of sequences per iteration.')
+    parser.add_argument(
+        '--num-lookahead-slots',
+        type=int,
+        default=EngineArgs.num_lookahead_slots,
+        help='Experimental scheduling config necessary for '
+        'speculative decoding. This will be replaced by '
+        'speculative config in the future; it is present '
+        'to enable correctness tests until then.')
+    parser.add_argument('--num-scheduler-steps',
+                        type=int,
+                        default=1,
+                        help=('Maximum number of forward steps per '
+                              'scheduler call.'))
+    parser.add_argument(
+        '--scheduler-delay-factor',
+        type=float,
+        default=EngineArgs.scheduler_delay_factor,
+        help='Apply a delay (of delay factor multiplied by previous '
+        'prompt latency) before scheduling next prompt.')
+    parser.add_argument(
+        '--preemption-mode',
+        type=str,
+        default=None,
+        help='If \'recompute\', the engine performs preemption by '
+        'recomputing; If \'swap\', the engine performs preemption by '
+        'block swapping.')
+    parser.add_argument(
+        '--scheduling-policy',
+        type=sys.intern,
+        choices=_SCHEDULING_POLICY_CHOICES,
+        default="fcfs",
+        help='The scheduling policy to use. "fcfs" (first come first served'
+        ', i.e. requests are handled in order of arrival; default) '
+        'or "priority" (requests are handled based on given '
+        'priority (lower value means earlier handling) and time of '
+        'arrival deciding any ties).')
+    parser.add_argument(
+        '--scheduler-cls',
+        default=EngineArgs.scheduler_cls,
+        help='The scheduler class to use. "vllm.core.scheduler.Scheduler" '
+        'is the default scheduler. Can be a class directly or the path to '
+        'a class of form "mod.custom_class".')
+    parser.add_argument(
+        "--disable-chunked-mm-input",
+        action=StoreBoolean,
+        default=EngineArgs.disable_chunked_mm_input,
+        nargs="?",
+        const="False",
+        help="Disable multimodal input chunking attention for V1. "
+        "If set to true and chunked prefill is enabled, we do not want to"
+        " partially schedule a multimodal item. This ensures that if a "
+        "request has a mixed prompt (like text tokens TTTT followed by "
+        "image tokens IIIIIIIIII) where only some image tokens can be "
+        "scheduled (like TTTTIIIII, leaving IIIII), it will be scheduled "
+        "as TTTT in one step and IIIIIIIIII in the next.")
+
+
+def _add_quant_args(parser: argparse._ActionsContainer) -> None:
+    """Quantization arguments."""
+    parser.add_argument('--quantization',
+                        '-q',
+                        type=nullable_str,
+                        choices=[*QUANTIZATION_METHODS, None],
+                        default=EngineArgs.quantization,
+                        help='Method used to quantize the weights. If '
+                        'None, we first check the `quantization_config` '
+                        'attribute in the model config file. If that is '
+                        'None, we assume the model weights are not '
+                        'quantized and use `dtype` to determine the data '
+                        'type of the weights.')
+
+
+def _add_mm_args(parser: argparse._ActionsContainer) -> None:
+    """Multimodal arguments."""
+    parser.add_argument(
+        '--limit-mm-per-prompt',
+        type=_cached_nullable_kvs,
+        default=EngineArgs.limit_mm_per_prompt,
+        # The default value is given in
+        # MultiModalConfig.get_limit_per_prompt
+        help=('For each multimodal plugin, limit how many '
+              'input instances to allow for each prompt. '
+              'Expects a comma-separated list of items, '
+              'e.g.: `image=16,video=2` allows a maximum of 16 '
+              'images and 2 videos per prompt. Defaults to 1 for '
+              'each modality.'))
+    parser.add_argument(
+        '--mm-processor-kwargs',
+        default=None,
+        type=json_loads,
+        help=('Overrides for the multimodal input mapping/processing, '
+              'e.g., image processor. For example: ``{"num_crops": 4}``.'))
+
+
+def _add_lora_args(parser: argparse._ActionsContainer) -> None:
+    """LoRA arguments."""
+    parser.add_argument('--max-loras',
+                        type=int,
+                        default=EngineArgs.max_loras,
+                        help='Max number of LoRAs in a single batch.')
+    parser.add_argument('--max-lora-rank',
+                        type=int,
+                        default=EngineArgs.max_lora_rank,
+                        help='Max LoRA rank.')
+    parser.add_argument(
+        '--lora-extra-vocab-size',
+        type=int,
+        default=EngineArgs.lora_extra_vocab_size,
+        help=('Maximum size of extra vocabulary that can be '
+              'present in a LoRA adapter (added to the base '
+              'model vocabulary).'))
+    parser.add_argument(
+        '--lora-dtype',
+        type=sys.intern,
+        default=EngineArgs.lora_dtype,
+        choices=_LORA_DTYPE_CHOICES,
+        help=('Data type for LoRA. If auto, will default to '
+              'base model dtype.'))
+    parser.add_argument(
+        '--max-cpu-loras',
+        type=int,
+        default=EngineArgs.max_cpu_loras,
+        help=('Maximum number of LoRAs to store in CPU memory. '
+              'Must be >= than max_loras.'))
+    parser.add_argument(
+        "--long-lora-scaling-factors",
+        type=nullable_float_tuple,
+        default=EngineArgs.long_lora_scaling_factors,
+        help=("Specify multiple scaling factors (which can "
+              "be different from base model scaling factor "
+              "- see eg. Long LoRA) to allow for multiple "
+              "LoRA adapters trained with those scaling "
+              "factors to be used at the same time. If not "
+              "specified, only adapters trained with the "
+              "base model scaling factor are allowed."))
+
+
+def _add_prompt_adapter_args(parser: argparse._ActionsContainer) -> None:
+    """Prompt adapter arguments."""
+    parser.add_argument('--max-prompt-adapters',
+                        type=int,
+                        default=EngineArgs.max_prompt_adapters,
+                        help='Max number of PromptAdapters in a batch.')
+    parser.add_argument('--max-prompt-adapter-token',
+                        type=int,
+                        default=EngineArgs.max_prompt_adapter_token,
+                        help='Max number of PromptAdapters tokens')
+
+
+def _add_spec_decoding_args(parser: argparse._ActionsContainer) -> None:
+    """Speculative decoding arguments."""
+    parser.add_argument('--speculative-config',
+                        type=json_loads,
+                        default=None,
+                        help='The configurations for speculative decoding.'
+                        ' Should be a JSON string.')
+
+
+def _add_decoding_args(parser: argparse._ActionsContainer) -> None:
+    """Guided decoding and reasoning arguments."""
+    parser.add_argument(
+        '--guided-decoding-backend',
+        type=str,
+        default='xgrammar',
+        help='Which engine will be used for guided decoding'
+        ' (JSON schema / regex etc) by default. Currently support '
+        'https://github.com/mlc-ai/xgrammar and '
+        'https://github.com/guidance-ai/llguidance.'
+        'Valid backend values are "xgrammar", "guidance", and "auto". '
+        'With "auto", we will make opinionated choices based on request'
+        'contents and what the backend libraries currently support, so '
+        'the behavior is subject to change in each release.')
+    parser.add_argument(
+        "--reasoning-parser",
+        type=str,
+        choices=list(ReasoningParserManager.reasoning_parsers),
+        default=None,
+        help=
+        "Select the reasoning parser depending on the model that you're "
+        "using. This is used to parse the reasoning content into OpenAI "
+        "API format. Required for ``--enable-reasoning``.")
+
+
+def _add_observability_args(parser: argparse._ActionsContainer) -> None:
+    """Logging, metrics and tracing arguments."""
+    parser.add_argument('--show-hidden-metrics-for-version',
+                        type=str,
+                        default=None,
+                        help='Enable deprecated Prometheus metrics that '
+                        'have been hidden since the specified version. '
+                        'For example, if a previously deprecated metric '
+                        'has been hidden since the v0.7.0 release, you '
+                        'use --show-hidden-metrics-for-version=0.7 as a '
+                        'temporary escape hatch while you migrate to new '
+                        'metrics. The metric is likely to be removed '
+                        'completely in an upcoming release.')
+    parser.add_argument(
+        '--otlp-traces-endpoint',
+        type=str,
+        default=None,
+        help='Target URL to which OpenTelemetry traces will be sent.')
+    parser.add_argument(
+        '--collect-detailed-traces',
+        type=str,
+        default=None,
+        help="Valid choices are " + _DETAILED_TRACE_MODULES_STR +
+        ". It makes sense to set this only if ``--otlp-traces-endpoint`` is"
+        " set. If set, it will collect detailed traces for the specified "
+        "modules. This involves use of possibly costly and or blocking "
+        "operations and hence might have a performance impact.")
+
+
+def _add_device_args(parser: argparse._ActionsContainer) -> None:
+    """Device and platform arguments."""
+    parser.add_argument("--device",
+                        type=sys.intern,
+                        default=EngineArgs.device,
+                        choices=DEVICE_OPTIONS,
+                        help='Device type for vLLM execution.')
+    parser.add_argument(
+        "--additional-config",
+        type=json_loads,
+        default=None,
+        help="Additional config for specified platform in JSON format. "
+        "Different platforms may support different configs. Make sure the "
+        "configs are valid for the platform you are using. The input format"
+        " is like '{\"config_key\":\"config_value\"}'")
+
+
+def _add_compilation_args(parser: argparse._ActionsContainer) -> None:
+    """Compilation arguments."""
+    parser.add_argument('--compilation-config',
+                        '-O',
+                        type=CompilationConfig.from_cli,
+                        default=None,
+                        help='torch.compile configuration for the model.'
+                        'When it is a number (0, 1, 2, 3), it will be '
+                        'interpreted as the optimization level.\n'
+                        'NOTE: level 0 is the default level without '
+                        'any optimization. level 1 and 2 are for internal '
+                        'testing only. level 3 is the recommended level '
+                        'for production.\n'
+                        'To specify the full compilation config, '
+                        'use a JSON string.\n'
+                        'Following the convention of traditional '
+                        'compilers, using -O without space is also '
+                        'supported. -O3 is equivalent to -O 3.')
+
+
+def _add_kv_transfer_args(parser: argparse._ActionsContainer) -> None:
+    """KV transfer arguments."""
+    parser.add_argument('--kv-transfer-config',
+                        type=KVTransferConfig.from_cli,
+                        default=None,
+                        help='The configurations for distributed KV cache '
+                        'transfer. Should be a JSON string.')
+
+
+# Plain `nullable_str` arguments and `store_true` flags only differ in their
+# flag, default and help, so they are kept in per-group tables instead of
+# spelling out an `add_argument` call for each. See `_add_arg_group`.
+
+# (flag, default, help) of the `nullable_str` arguments of each group.
+_NULLABLE_STR_ARGS: Dict[str, Tuple[Tuple[str, Optional[str], str], ...]] = {
+    "Model": (
+        ("--tokenizer", EngineArgs.tokenizer,
+         "Name or path of the huggingface tokenizer to use. If unspecified, "
+         "model name or path will be used."),
+        ("--hf-config-path", EngineArgs.hf_config_path,
+         "Name or path of the huggingface config to use. If unspecified, "
+         "model name or path will be used."),
+        ("--revision", None,
+         "The specific model version to use. It can be a branch name, a tag "
+         "name, or a commit id. If unspecified, will use the default version."),
+        ("--code-revision", None,
+         "The specific revision to use for the model code on Hugging Face "
+         "Hub. It can be a branch name, a tag name, or a commit id. If "
+         "unspecified, will use the default version."),
+        ("--tokenizer-revision", None,
+         "Revision of the huggingface tokenizer to use. It can be a branch "
+         "name, a tag name, or a commit id. If unspecified, will use the "
+         "default version."),
+        ("--generation-config", "auto",
+         "The folder path to the generation config. Defaults to 'auto', the "
+         "generation config will be loaded from model path. If set to "
+         "'vllm', no generation config is loaded, vLLM defaults will be "
+         "used. If set to a folder path, the generation config will be "
+         "loaded from the specified folder path. If `max_new_tokens` is "
+         "specified in generation config, then it sets a server-wide limit "
+         "on the number of output tokens for all requests."),
+    ),
+    "Model loading": (
+        ("--download-dir", EngineArgs.download_dir,
+         "Directory to download and load the weights."),
+        ("--model-loader-extra-config", EngineArgs.model_loader_extra_config,
+         "Extra config for model loader. This will be passed to the model "
+         "loader corresponding to the chosen load_format. This should be a "
+         "JSON string that will be parsed into a dictionary."),
+    ),
+    "Parallelism": (
+        ("--tokenizer-pool-extra-config",
+         EngineArgs.tokenizer_pool_extra_config,
+         "Extra config for tokenizer pool. This should be a JSON string that "
+         "will be parsed into a dictionary. Ignored if tokenizer_pool_size "
+         "is 0."),
+    ),
+}
+
+
+# (flag, default, help) of the `store_true` flags of each group.
+_STORE_TRUE_FLAGS: Dict[str, Tuple[Tuple[str, bool, str], ...]] = {
+    "Model": (
+        ("--skip-tokenizer-init", False,
+         "Skip initialization of tokenizer and detokenizer. Expects valid "
+         "prompt_token_ids and None for prompt from the input. The generated "
+         "output will contain token ids."),
+        ("--trust-remote-code", False, "Trust remote code from huggingface."),
+        ("--enforce-eager", False,
+         "Always use eager-mode PyTorch. If False, will use eager mode and "
+         "CUDA graph in hybrid for maximal performance and flexibility."),
+        ("--disable-sliding-window", False,
+         "Disables sliding window, capping to sliding window size."),
+        ("--disable-cascade-attn", False,
+         "Disable cascade attention for V1. While cascade attention does not "
+         "change the mathematical correctness, disabling it could be useful "
+         "for preventing potential numerical issues. Note that even if this "
+         "is set to False, cascade attention will be only used when the "
+         "heuristic tells that it's beneficial."),
+        ("--disable-async-output-proc", EngineArgs.disable_async_output_proc,
+         "Disable async output processing. This may result in lower "
+         "performance."),
+        ("--enable-sleep-mode", False,
+         "Enable sleep mode for the engine. (only cuda platform is supported)"),
+    ),
+    "Parallelism": (
+        ("--enable-expert-parallel", False,
+         "Use expert parallelism instead of tensor parallelism for MoE "
+         "layers."),
+        ("--ray-workers-use-nsight", False,
+         "If specified, use nsight to profile Ray workers."),
+        ("--disable-custom-all-reduce", EngineArgs.disable_custom_all_reduce,
+         "See ParallelConfig."),
+    ),
+    "KV cache": (
+        ("--use-v2-block-manager", True,
+         "[DEPRECATED] block manager v1 has been removed and "
+         "SelfAttnBlockSpaceManager (i.e. block manager v2) is now the "
+         "default. Setting this flag to True or False has no effect on vLLM "
+         "behavior."),
+        ("--calculate-kv-scales", False,
+         "This enables dynamic calculation of k_scale and v_scale when "
+         "kv-cache-dtype is fp8. If calculate-kv-scales is false, the scales "
+         "will be loaded from the model checkpoint if available. Otherwise, "
+         "the scales will default to 1.0."),
+    ),
+    "Multimodal": (
+        ("--disable-mm-preprocessor-cache", False,
+         "If true, then disables caching of the multi-modal "
+         "preprocessor/mapper. (not recommended)"),
+    ),
+    "LoRA": (
+        ("--enable-lora", False, "If True, enable handling of LoRA adapters."),
+        ("--enable-lora-bias", False,
+         "If True, enable bias for LoRA adapters."),
+        ("--fully-sharded-loras", False,
+         "By default, only half of the LoRA computation is sharded with "
+         "tensor parallelism. Enabling this will use the fully sharded "
+         "layers. At high sequence length, max rank or tensor parallel size, "
+         "this is likely faster."),
+    ),
+    "Prompt adapter": (
+        ("--enable-prompt-adapter", False,
+         "If True, enable handling of PromptAdapters."),
+    ),
+    "Decoding": (
+        ("--enable-reasoning", False,
+         "Whether to enable reasoning_content for the model. If enabled, the "
+         "model will be able to generate reasoning content."),
+    ),
+    "Observability": (
+        ("--disable-log-stats", False, "Disable logging statistics."),
+    ),
+}
+
+
+# (flag, default, help) of the `StoreBoolean` flags of each group, which
+# take an optional "true"/"false" value and are true when given without one.
+_STORE_BOOLEAN_FLAGS: Dict[str, Tuple[Tuple[str, bool, str], ...]] = {
+    "Scheduler": (
+        ("--multi-step-stream-outputs", EngineArgs.multi_step_stream_outputs,
+         "If False, then multi-step will stream outputs at the end of all "
+         "steps"),
+        ("--enable-chunked-prefill", EngineArgs.enable_chunked_prefill,
+         "If set, the prefill requests can be chunked based on the "
+         "max_num_batched_tokens."),
+    ),
+}
+
+
+# Engine argument groups, in the order they are shown in ``--help``.
+_ENGINE_ARG_GROUPS = (
+    ("Model", _add_model_args),
+    ("Model loading", _add_load_args),
+    ("Parallelism", _add_parallel_args),
+    ("KV cache", _add_kv_cache_args),
+    ("Scheduler", _add_scheduler_args),
+    ("Quantization", _add_quant_args),
+    ("Multimodal", _add_mm_args),
+    ("LoRA", _add_lora_args),
+    ("Prompt adapter", _add_prompt_adapter_args),
+    ("Speculative decoding", _add_spec_decoding_args),
+    ("Decoding", _add_decoding_args),
+    ("Observability", _add_observability_args),
+    ("Device", _add_device_args),
+    ("Compilation", _add_compilation_args),
+    ("KV transfer", _add_kv_transfer_args),
+)
+
+# The tables above are looked up by group title, so entries under a title
+# that is not in `_ENGINE_ARG_GROUPS` would silently be left out of the CLI.
+assert {*_NULLABLE_STR_ARGS, *_STORE_TRUE_FLAGS, *_STORE_BOOLEAN_FLAGS} <= {
+    title for title, _ in _ENGINE_ARG_GROUPS
+}, "Argument tables refer to unknown argument groups"
+
+
+def _add_arg_group(parser: FlexibleArgumentParser, title: str,
+                   add_args: Callable[[argparse._ActionsContainer],
+                                      None]) -> None:
+    """Add a group of engine arguments to `parser`.
+
+    With a `FlexibleArgumentParser`, the group is only built once the parser
+    is actually used, so that e.g. `vllm chat --help` does not pay for
+    constructing the arguments of `vllm serve`. Any other argument
+    container gets the arguments right away.
+
+    Besides the arguments added by `add_args`, the group gets the entries of
+    `_NULLABLE_STR_ARGS`, `_STORE_TRUE_FLAGS` and `_STORE_BOOLEAN_FLAGS` under
+    the same title.
+
+    Except for `_DYNAMIC_ARG_GROUPS`, the groups of a `FlexibleArgumentParser`
+    are only built once per process, and other parsers get copies of their
+    actions.
+    """
+
+    def add_group_args(group: argparse._ActionsContainer) -> None:
+        # Actions built with a different `argument_default` would differ.
+        if (title in _DYNAMIC_ARG_GROUPS
+                or group.argument_default is not None):
+            _build_arg_group(group, title, add_args)
+            return
+        for action in _arg_group_actions(title, add_args):
+            group._add_action(_copy_action(action))
+
+    if isinstance(parser, FlexibleArgumentParser):
+        parser.add_lazy_arguments(
+            lambda p: add_group_args(p.add_argument_group(title)))
+    else:
+        _build_arg_group(parser, title, add_args)
+
+
+def _build_arg_group(group: argparse._ActionsContainer, title: str,
+                     add_args: Callable[[argparse._ActionsContainer],
+                                        None]) -> None:
+    add_args(group)
+    for flag, default, help in _NULLABLE_STR_ARGS.get(title, ()):
+        group.add_argument(flag,
+                           type=nullable_str,
+                           default=default,
+                           help=help)
+    for flag, default, help in _STORE_TRUE_FLAGS.get(title, ()):
+        group.add_argument(flag,
+                           action='store_true',
+                           default=default,
+                           help=help)
+    for flag, default, help in _STORE_BOOLEAN_FLAGS.get(title, ()):
+        group.add_argument(flag,
+                           action=StoreBoolean,
+                           default=default,
+                           nargs="?",
+                           const="True",
+                           help=help)
+
+
+def _copy_action(action: argparse.Action) -> argparse.Action:
+    # A plain `copy.copy` spends more time in the copy protocol than
+    # argparse spends on creating the action in the first place.
+    copied = object.__new__(type(action))
+    copied.__dict__.update(action.__dict__)
+    # Parsers modify some of these in place, e.g. conflict_handler="resolve"
+    # removes overridden flags from `option_strings`, so the cached action
+    # must not share them.
+    copied.option_strings = list(action.option_strings)
+    for name in ("choices", "metavar", "default"):
+        value = getattr(action, name)
+        if isinstance(value, list):
+            setattr(copied, name, list(value))
+    return copied
+
+
+# Argument groups whose choices come from registries that plugins and
+# platforms can extend at any time (quantization methods, reasoning parsers).
+# They are built anew for every parser instead of being copied.
+_DYNAMIC_ARG_GROUPS = frozenset({"Quantization", "Decoding"})
+
+# The actions of each argument group by title, see `_arg_group_actions`.
+_ARG_GROUP_ACTIONS: Dict[str, List[argparse.Action]] = {}
+_ARG_GROUP_ACTIONS_LOCK = threading.Lock()
+
+
+def _arg_group_actions(
+        title: str, add_args: Callable[[argparse._ActionsContainer], None]
+) -> List[argparse.Action]:
+    """The actions of an argument group, built once per process on a
+    scratch parser.
+
+    Most of the cost of `add_argument` is in validating the arguments and
+    creating the action, so other parsers get copies of these actions.
+    The group functions themselves, including their `EngineArgs.<field>`
+    default lookups, thus run once per process, and their defaults are
+    already a snapshot of the class defaults.
+
+    This is what `parents=[...]` would give, except that argparse shares
+    the actions of parent parsers, so e.g. `set_defaults` on one parser
+    would change the defaults of all others. The scratch parsers are also
+    only built when a parser first needs the group, not at import time.
+    """
+    with _ARG_GROUP_ACTIONS_LOCK:
+        actions = _ARG_GROUP_ACTIONS.get(title)
+        if actions is None:
+            scratch = argparse.ArgumentParser(add_help=False)
+            _build_arg_group(scratch, title, add_args)
+            actions = _ARG_GROUP_ACTIONS[title] = scratch._actions
+    return actions
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of an engine argument value. Raises `TypeError` if
+    `value` can't be hashed."""
+    if isinstance(value, dict):
+        return (dict, frozenset((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return (list, tuple(_freeze(v) for v in value))
+    if isinstance(value, set):
+        return frozenset(value)
+    hash(value)
+    return value
+
+
 def _raise_or_fallback(feature_name: str, recommend_to_remove: bool):
     if envs.is_set("VLLM_USE_V1") and envs.VLLM_USE_V1:
         raise NotImplementedError(
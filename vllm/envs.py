@@ -107,6 +107,7 @@ if TYPE_CHECKING:
     VLLM_TPU_BUCKET_PADDING_GAP: int = 0
     VLLM_USE_DEEP_GEMM: bool = False
     VLLM_XGRAMMAR_CACHE_MB: int = 0
+    VLLM_MEMOIZE_ENGINE_CONFIG: bool = False
 
 
 def get_default_cache_root():
@@ -704,6 +705,12 @@ environment_variables: dict[str, Callable[[], Any]] = {
     # It can be changed with this variable if needed for some reason.
     "VLLM_XGRAMMAR_CACHE_MB":
     lambda: int(os.getenv("VLLM_XGRAMMAR_CACHE_MB", "512")),
+
+    # If set, `EngineArgs.create_engine_config` reuses a copy of the config
+    # built before for identical engine arguments in the same process. This
+    # is meant for tests and benchmarks that create many engine configs.
+    "VLLM_MEMOIZE_ENGINE_CONFIG":
+    lambda: bool(int(os.getenv("VLLM_MEMOIZE_ENGINE_CONFIG", "0"))),
 }
 
 # end-env-vars-definition
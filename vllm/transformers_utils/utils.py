@@ -1,9 +1,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
-from functools import cache
+from functools import cache, lru_cache
 from os import PathLike
 from pathlib import Path
+from stat import S_ISREG
 from typing import List, Optional, Union
 
 from vllm.envs import VLLM_MODEL_REDIRECT_PATH
@@ -19,21 +20,35 @@ def is_s3(model_or_path: str) -> bool:
 def check_gguf_file(model: Union[str, PathLike]) -> bool:
     """Check if the file is a GGUF model."""
     model = Path(model)
-    if not model.is_file():
+    try:
+        stat_result = model.stat()
+    except (OSError, ValueError):
+        return False
+
+    if not S_ISREG(stat_result.st_mode):
         return False
     elif model.suffix == ".gguf":
         return True
 
     try:
-        with model.open("rb") as f:
-            header = f.read(4)
-
-        return header == b"GGUF"
+        return _has_gguf_header(model, stat_result.st_mtime_ns,
+                                stat_result.st_size)
     except Exception as e:
+        # Not cached, so that e.g. a transient permission error is retried.
         logger.debug("Error reading file %s: %s", model, e)
         return False
 
 
+@lru_cache(maxsize=64)
+def _has_gguf_header(model: Path, mtime_ns: int, size: int) -> bool:
+    # The modification time and size are only part of the cache key, so that
+    # the header is read again if the file changes.
+    with model.open("rb") as f:
+        header = f.read(4)
+
+    return header == b"GGUF"
+
+
 def modelscope_list_repo_files(
     repo_id: str,
     revision: Optional[str] = None,
@@ -25,6 +25,7 @@ import socket
 import subprocess
 import sys
 import tempfile
+import textwrap
 import threading
 import time
 import traceback
@@ -1221,6 +1222,18 @@ class StoreBoolean(argparse.Action):
                              "Expected 'true' or 'false'.")
 
 
+_HELP_WHITESPACE_RE = re.compile(r"\s+", re.ASCII)
+
+
+@lru_cache(maxsize=1024)
+def _split_help_lines(text: str, width: int) -> tuple[str, ...]:
+    """Same as `argparse.HelpFormatter._split_lines`, but cached. The engine
+    arguments alone have over a hundred long help texts, and wrapping them
+    is most of the cost of formatting the help."""
+    return tuple(
+        textwrap.wrap(_HELP_WHITESPACE_RE.sub(" ", text).strip(), width))
+
+
 class SortedHelpFormatter(argparse.ArgumentDefaultsHelpFormatter):
     """SortedHelpFormatter that sorts arguments by their option strings."""
 
@@ -1228,6 +1241,9 @@ class SortedHelpFormatter(argparse.ArgumentDefaultsHelpFormatter):
         actions = sorted(actions, key=lambda x: x.option_strings)
         super().add_arguments(actions)
 
+    def _split_lines(self, text, width):
+        return list(_split_help_lines(text, width))
+
 
 class FlexibleArgumentParser(argparse.ArgumentParser):
     """ArgumentParser that allows both underscore and dash in names."""
@@ -1236,9 +1252,70 @@ class FlexibleArgumentParser(argparse.ArgumentParser):
         # Set the default 'formatter_class' to SortedHelpFormatter
         if 'formatter_class' not in kwargs:
             kwargs['formatter_class'] = SortedHelpFormatter
+        # Callbacks registered via `add_lazy_arguments`, run on first use
+        self._lazy_arguments: list[Callable[[FlexibleArgumentParser],
+                                            object]] = []
+        self._adding_lazy_arguments = False
         super().__init__(*args, **kwargs)
 
+    def add_lazy_arguments(
+            self, add_arguments: Callable[[FlexibleArgumentParser],
+                                          object]) -> None:
+        """Defer `add_arguments(self)` until the parser is first used to
+        parse arguments or to format its help or usage.
+
+        This keeps building large parsers cheap when they end up unused,
+        e.g. the parser of a subcommand other than the one being invoked.
+        Callbacks run in the order in which they were registered.
+        """
+        self._lazy_arguments.append(add_arguments)
+
+    def _add_lazy_arguments(self) -> None:
+        if self._adding_lazy_arguments:
+            return
+        self._adding_lazy_arguments = True
+        try:
+            while self._lazy_arguments:
+                num_actions = len(self._actions)
+                self._lazy_arguments.pop(0)(self)
+                # Respect `set_defaults` calls made before the arguments
+                # existed
+                for action in self._actions[num_actions:]:
+                    if action.dest in self._defaults:
+                        action.default = self._defaults[action.dest]
+        finally:
+            self._adding_lazy_arguments = False
+
+    def _add_action(self, action):
+        # With conflict_handler="resolve", the last definition of an option
+        # wins, so the lazy arguments registered before it must come first.
+        if self.conflict_handler == "resolve":
+            self._add_lazy_arguments()
+        return super()._add_action(action)
+
+    def add_argument_group(self, *args, **kwargs):
+        if self.conflict_handler == "resolve":
+            self._add_lazy_arguments()
+        return super().add_argument_group(*args, **kwargs)
+
+    def parse_known_args(self, args=None, namespace=None):
+        self._add_lazy_arguments()
+        return super().parse_known_args(args, namespace)
+
+    def format_usage(self):
+        self._add_lazy_arguments()
+        return super().format_usage()
+
+    def format_help(self):
+        self._add_lazy_arguments()
+        return super().format_help()
+
+    def get_default(self, dest):
+        self._add_lazy_arguments()
+        return super().get_default(dest)
+
     def parse_args(self, args=None, namespace=None):
+        self._add_lazy_arguments()
         if args is None:
             args = sys.argv[1:]
 